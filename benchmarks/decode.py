@@ -0,0 +1,46 @@
+"""Measure how long it takes to turn raw evdev codes into names.
+
+Compares the precompiled DeviceManager.get_event_names lookup with
+the older get_event_type / get_event_string pair.
+
+Run from the top of the source tree:
+
+    python -m benchmarks.decode
+"""
+
+import timeit
+from unittest import mock
+
+from inputs.manager import DeviceManager
+
+NUMBER = 200000
+
+# A mix of the events that a keyboard and a mouse send.
+EVENTS = ((1, 30), (4, 4), (0, 0), (2, 0), (2, 1), (3, 0x35))
+
+
+def old_lookup(manager):
+    """Two nested lookups per event."""
+    for raw_type, code in EVENTS:
+        event_type = manager.get_event_type(raw_type)
+        manager.get_event_string(event_type, code)
+
+
+def new_lookup(manager):
+    """One precompiled lookup per event."""
+    for raw_type, code in EVENTS:
+        manager.get_event_names(raw_type, code)
+
+
+def main():
+    """Print the time per event for each approach."""
+    with mock.patch.object(DeviceManager, "_post_init"):
+        manager = DeviceManager()
+    for function in (old_lookup, new_lookup):
+        seconds = timeit.timeit(lambda: function(manager), number=NUMBER)
+        per_event = seconds / (NUMBER * len(EVENTS)) * 1e9
+        print("%s: %.0f ns per event" % (function.__name__, per_event))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Measure how long it takes to import inputs and to make a DeviceManager.
+
+Each import is timed in a fresh interpreter, so nothing is already
+loaded. Run it with and without PYTHONDONTWRITEBYTECODE=1 to see the
+cost with and without cached bytecode.
+
+Run from the top of the source tree:
+
+    python -m benchmarks.import_time
+"""
+
+import statistics
+import subprocess
+import sys
+import timeit
+from unittest import mock
+
+RUNS = 20
+NUMBER = 200
+
+IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import inputs
+print(time.perf_counter() - start)
+print(",".join(sorted(
+    name for name in sys.modules if name.startswith("inputs._constants")
+)))
+"""
+
+
+def time_import():
+    """Get the median import time and the platform tables loaded."""
+    times = []
+    loaded = ""
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout.splitlines()
+        times.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else ""
+    return statistics.median(times), loaded
+
+
+def time_manager():
+    """Get the time to make a DeviceManager, without looking for devices."""
+    # pylint: disable=import-outside-toplevel
+    from inputs.manager import DeviceManager
+
+    with mock.patch.object(DeviceManager, "_post_init"):
+        seconds = timeit.timeit(DeviceManager, number=NUMBER)
+    return seconds / NUMBER
+
+
+def main():
+    """Print the import and manager construction times."""
+    seconds, loaded = time_import()
+    print("import inputs: %.2f ms (median of %d)" % (seconds * 1e3, RUNS))
+    print("platform tables loaded: %s" % (loaded or "none"))
+    print("DeviceManager(): %.1f us" % (time_manager() * 1e6))
+
+
+if __name__ == "__main__":
+    main()
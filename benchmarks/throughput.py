@@ -0,0 +1,99 @@
+"""Measure how many events a second a device can be read at.
+
+The events go through a fake /dev/input tree of FIFOs (see
+tests/fakedev.py), so they take the same path through DeviceManager
+and InputDevice as real ones, from the read of the character device
+to the objects, tuples or arrays handed back. A thread writes the
+events as fast as they are read.
+
+Run from the top of the source tree, on Linux:
+
+    python -m benchmarks.throughput [number of events]
+"""
+
+import sys
+import threading
+import time
+
+from inputs.devices.base import RAW_NUMPY, RAW_TUPLES
+from inputs.libi.c import event_dtype
+
+from tests.fakedev import FakeInputTree, pack_events
+
+EVENTS = 1000000
+READ_SIZE = 256
+
+# A key going down and then up, each in its own report.
+PATTERN = pack_events([(1, 30, 1)]) + pack_events([(1, 30, 0)])
+PATTERN_EVENTS = 4
+CHUNK_REPEATS = 256
+
+
+def produce(fake, total):
+    """Write total events (rounded up to whole patterns) to fake."""
+    chunk = PATTERN * CHUNK_REPEATS
+    chunk_events = PATTERN_EVENTS * CHUNK_REPEATS
+    written = 0
+    while written < total:
+        fake.write(chunk)
+        written += chunk_events
+
+
+def read_batches(device, total):
+    """Read with iter(device), whatever its raw mode."""
+    count = 0
+    for events in device:
+        count += len(events)
+        if count >= total:
+            return count
+    return count
+
+
+def read_frames(device, total):
+    """Read with device.frames(), counting the SYN_REPORTs too."""
+    count = 0
+    for frame in device.frames():
+        count += len(frame) + 1
+        if count >= total:
+            return count
+    return count
+
+
+def measure(fake, device, reader, total):
+    """Time reading total events from device with reader."""
+    producer = threading.Thread(target=produce, args=(fake, total), daemon=True)
+    start = time.perf_counter()
+    producer.start()
+    count = reader(device, total)
+    seconds = time.perf_counter() - start
+    producer.join()
+    return count / seconds
+
+
+def main():
+    """Print the events per second for each way of reading."""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else EVENTS
+    modes = [
+        ("InputEvent objects", None, read_batches),
+        ("tuples", RAW_TUPLES, read_batches),
+        ("frames", None, read_frames),
+    ]
+    try:
+        event_dtype()
+    except ImportError:
+        print("numpy is not installed, skipping the numpy mode")
+    else:
+        modes.insert(2, ("numpy", RAW_NUMPY, read_batches))
+
+    for label, raw_mode, reader in modes:
+        with FakeInputTree() as tree:
+            fake = tree.add_device("Benchmark Keyboard")
+            device = tree.manager(read_size=READ_SIZE).keyboards[0]
+            device.set_raw_mode(raw_mode)
+            rate = measure(fake, device, reader, total)
+            device.close()
+        print("%s: %.0f events/s" % (label, rate))
+
+
+if __name__ == "__main__":
+    main()
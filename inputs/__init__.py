@@ -44,7 +44,9 @@ from .devices.base import OtherDevice
 from .devices.mouse.mouse import Mouse, MightyMouse
 from .devices.keyboard.keyboard import Keyboard
 from .devices.led.led import LED, GamepadLED, SystemLED
+from .devices.virtual.virtual import VirtualDevice
 from .manager import DeviceManager
+from .router import EventRouter
 from .utils import devices, get_gamepad, get_key, get_mouse
 
 __version__ = "0.6"
@@ -58,7 +60,9 @@ __all__ = [
     "GamepadLED",
     "SystemLED",
     "OtherDevice",
+    "VirtualDevice",
     "DeviceManager",
+    "EventRouter",
     "devices",
     "get_gamepad",
     "get_key",
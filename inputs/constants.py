@@ -1,4 +1,11 @@
-"""Constants for input devices."""
+"""Constants for input devices.
+
+The tables that are only needed on Windows or the Mac live in
+_constants_win and _constants_mac, and are only loaded when one of
+them is first used, e.g. inputs.constants.WINCODES.
+"""
+
+import importlib
 
 SPECIAL_DEVICES = (
     (
@@ -781,404 +788,6 @@ SOUNDS = (
     (0x07 + 1, "SND_CNT"),
 )
 
-WIN_KEYBOARD_CODES = {
-    0x0100: 1,
-    0x0101: 0,
-    0x104: 1,
-    0x105: 0,
-}
-
-WIN_MOUSE_CODES = {
-    0x0201: (0x110, 1, 589825),  # WM_LBUTTONDOWN --> BTN_LEFT
-    0x0202: (0x110, 0, 589825),  # WM_LBUTTONUP   --> BTN_LEFT
-    0x0204: (0x111, 1, 589826),  # WM_RBUTTONDOWN --> BTN_RIGHT
-    0x0205: (0x111, 0, 589826),  # WM_RBUTTONUP   --> BTN_RIGHT
-    0x0207: (0x112, 1, 589827),  # WM_MBUTTONDOWN --> BTN_MIDDLE
-    0x0208: (0x112, 0, 589827),  # WM_MBUTTONU    --> BTN_MIDDLE
-    0x020B: (0x113, 1, 589828),  # WM_XBUTTONDOWN --> BTN_SIDE
-    0x020C: (0x113, 0, 589828),  # WM_XBUTTONUP   --> BTN_SIDE
-    0x020B2: (0x114, 1, 589829),  # WM_XBUTTONDOWN --> BTN_EXTRA
-    0x020C2: (0x114, 0, 589829),  # WM_XBUTTONUP   --> BTN_EXTRA
-}
-
-# THING SING That thing can sing!
-# SONG LONG A long, long song.
-# Good-bye, Thing. You sing too long.
-# pylint: disable=too-many-lines
-
-WINCODES = (
-    (0x01, 0x110),  # Left mouse button
-    (0x02, 0x111),  # Right mouse button
-    (0x03, 0),  # Control-break processing
-    (0x04, 0x112),  # Middle mouse button (three-button mouse)
-    (0x05, 0x113),  # X1 mouse button
-    (0x06, 0x114),  # X2 mouse button
-    (0x07, 0),  # Undefined
-    (0x08, 14),  # BACKSPACE key
-    (0x09, 15),  # TAB key
-    (0x0A, 0),  # Reserved
-    (0x0B, 0),  # Reserved
-    (0x0C, 0x163),  # CLEAR key
-    (0x0D, 28),  # ENTER key
-    (0x0E, 0),  # Undefined
-    (0x0F, 0),  # Undefined
-    (0x10, 42),  # SHIFT key
-    (0x11, 29),  # CTRL key
-    (0x12, 56),  # ALT key
-    (0x13, 119),  # PAUSE key
-    (0x14, 58),  # CAPS LOCK key
-    (0x15, 90),  # IME Kana mode
-    (0x15, 91),  # IME Hanguel mode (maintained for compatibility; use
-    # VK_HANGUL)
-    (0x15, 91),  # IME Hangul mode
-    (0x16, 0),  # Undefined
-    (0x17, 92),  # IME Junja mode - These all need to be fixed
-    (0x18, 93),  # IME final mode - By someone who
-    (0x19, 94),  # IME Hanja mode - Knows how
-    (0x19, 95),  # IME Kanji mode - Japanese Keyboards work
-    (0x1A, 0),  # Undefined
-    (0x1B, 1),  # ESC key
-    (0x1C, 0),  # IME convert
-    (0x1D, 0),  # IME nonconvert
-    (0x1E, 0),  # IME accept
-    (0x1F, 0),  # IME mode change request
-    (0x20, 57),  # SPACEBAR
-    (0x21, 104),  # PAGE UP key
-    (0x22, 109),  # PAGE DOWN key
-    (0x23, 107),  # END key
-    (0x24, 102),  # HOME key
-    (0x25, 105),  # LEFT ARROW key
-    (0x26, 103),  # UP ARROW key
-    (0x27, 106),  # RIGHT ARROW key
-    (0x28, 108),  # DOWN ARROW key
-    (0x29, 0x161),  # SELECT key
-    (0x2A, 210),  # PRINT key
-    (0x2B, 28),  # EXECUTE key
-    (0x2C, 99),  # PRINT SCREEN key
-    (0x2D, 110),  # INS key
-    (0x2E, 111),  # DEL key
-    (0x2F, 138),  # HELP key
-    (0x30, 11),  # 0 key
-    (0x31, 2),  # 1 key
-    (0x32, 3),  # 2 key
-    (0x33, 4),  # 3 key
-    (0x34, 5),  # 4 key
-    (0x35, 6),  # 5 key
-    (0x36, 7),  # 6 key
-    (0x37, 8),  # 7 key
-    (0x38, 9),  # 8 key
-    (0x39, 10),  # 9 key
-    #  (0x3A-40, 0),  # Undefined
-    (0x41, 30),  # A key
-    (0x42, 48),  # B key
-    (0x43, 46),  # C key
-    (0x44, 32),  # D key
-    (0x45, 18),  # E key
-    (0x46, 33),  # F key
-    (0x47, 34),  # G key
-    (0x48, 35),  # H key
-    (0x49, 23),  # I key
-    (0x4A, 36),  # J key
-    (0x4B, 37),  # K key
-    (0x4C, 38),  # L key
-    (0x4D, 50),  # M key
-    (0x4E, 49),  # N key
-    (0x4F, 24),  # O key
-    (0x50, 25),  # P key
-    (0x51, 16),  # Q key
-    (0x52, 19),  # R key
-    (0x53, 31),  # S key
-    (0x54, 20),  # T key
-    (0x55, 22),  # U key
-    (0x56, 47),  # V key
-    (0x57, 17),  # W key
-    (0x58, 45),  # X key
-    (0x59, 21),  # Y key
-    (0x5A, 44),  # Z key
-    (0x5B, 125),  # Left Windows key (Natural keyboard)
-    (0x5C, 126),  # Right Windows key (Natural keyboard)
-    (0x5D, 139),  # Applications key (Natural keyboard)
-    (0x5E, 0),  # Reserved
-    (0x5F, 142),  # Computer Sleep key
-    (0x60, 82),  # Numeric keypad 0 key
-    (0x61, 79),  # Numeric keypad 1 key
-    (0x62, 80),  # Numeric keypad 2 key
-    (0x63, 81),  # Numeric keypad 3 key
-    (0x64, 75),  # Numeric keypad 4 key
-    (0x65, 76),  # Numeric keypad 5 key
-    (0x66, 77),  # Numeric keypad 6 key
-    (0x67, 71),  # Numeric keypad 7 key
-    (0x68, 72),  # Numeric keypad 8 key
-    (0x69, 73),  # Numeric keypad 9 key
-    (0x6A, 55),  # Multiply key
-    (0x6B, 78),  # Add key
-    (0x6C, 96),  # Separator key
-    (0x6D, 74),  # Subtract key
-    (0x6E, 83),  # Decimal key
-    (0x6F, 98),  # Divide key
-    (0x70, 59),  # F1 key
-    (0x71, 60),  # F2 key
-    (0x72, 61),  # F3 key
-    (0x73, 62),  # F4 key
-    (0x74, 63),  # F5 key
-    (0x75, 64),  # F6 key
-    (0x76, 65),  # F7 key
-    (0x77, 66),  # F8 key
-    (0x78, 67),  # F9 key
-    (0x79, 68),  # F10 key
-    (0x7A, 87),  # F11 key
-    (0x7B, 88),  # F12 key
-    (0x7C, 183),  # F13 key
-    (0x7D, 184),  # F14 key
-    (0x7E, 185),  # F15 key
-    (0x7F, 186),  # F16 key
-    (0x80, 187),  # F17 key
-    (0x81, 188),  # F18 key
-    (0x82, 189),  # F19 key
-    (0x83, 190),  # F20 key
-    (0x84, 191),  # F21 key
-    (0x85, 192),  # F22 key
-    (0x86, 192),  # F23 key
-    (0x87, 194),  # F24 key
-    #  (0x88-8F, 0),  # Unassigned
-    (0x90, 69),  # NUM LOCK key
-    (0x91, 70),  # SCROLL LOCK key
-    #  (0x92-96, 0),  # OEM specific
-    #  (0x97-9F, 0),  # Unassigned
-    (0xA0, 42),  # Left SHIFT key
-    (0xA1, 54),  # Right SHIFT key
-    (0xA2, 29),  # Left CONTROL key
-    (0xA3, 97),  # Right CONTROL key
-    (0xA4, 125),  # Left MENU key
-    (0xA5, 126),  # Right MENU key
-    (0xA6, 158),  # Browser Back key
-    (0xA7, 159),  # Browser Forward key
-    (0xA8, 173),  # Browser Refresh key
-    (0xA9, 128),  # Browser Stop key
-    (0xAA, 217),  # Browser Search key
-    (0xAB, 0x16C),  # Browser Favorites key
-    (0xAC, 150),  # Browser Start and Home key
-    (0xAD, 113),  # Volume Mute key
-    (0xAE, 114),  # Volume Down key
-    (0xAF, 115),  # Volume Up key
-    (0xB0, 163),  # Next Track key
-    (0xB1, 165),  # Previous Track key
-    (0xB2, 166),  # Stop Media key
-    (0xB3, 164),  # Play/Pause Media key
-    (0xB4, 155),  # Start Mail key
-    (0xB5, 0x161),  # Select Media key
-    (0xB6, 148),  # Start Application 1 key
-    (0xB7, 149),  # Start Application 2 key
-    #  (0xB8-B9, 0),  # Reserved
-    (0xBA, 39),  # Used for miscellaneous characters; it can vary by keyboard.
-    (0xBB, 13),  # For any country/region, the '+' key
-    (0xBC, 51),  # For any country/region, the ',' key
-    (0xBD, 12),  # For any country/region, the '-' key
-    (0xBE, 52),  # For any country/region, the '.' key
-    (0xBF, 53),  # Slash
-    (0xC0, 40),  # Apostrophe
-    #  (0xC1-D7, 0),  # Reserved
-    #  (0xD8-DA, 0),  # Unassigned
-    (0xDB, 26),  # [
-    (0xDC, 86),  # \
-    (0xDD, 27),  # ]
-    (0xDE, 43),  # '
-    (0xDF, 119),  # VK_OFF - What's that?
-    (0xE0, 0),  # Reserved
-    (0xE1, 0),  # OEM Specific
-    (0xE2, 43),  # Either the angle bracket key or the backslash key
-    # on the RT 102-key keyboard (0xE3-E4, 0), # OEM
-    # specific
-    (0xE5, 0),  # IME PROCESS key
-    (0xE6, 0),  # OEM specific
-    (0xE7, 0),  # Used to pass Unicode characters as if they were
-    # keystrokes. The VK_PACKET key is the low word of a
-    # 32-bit Virtual Key value used for non-keyboard input
-    # methods. For more information, see Remark in
-    # KEYBDINPUT, SendInput, WM_KEYDOWN, and WM_KEYUP
-    (0xE8, 0),  # Unassigned
-    #  (0xE9-F5, 0),  # OEM specific
-    (0xF6, 0),  # Attn key
-    (0xF7, 0),  # CrSel key
-    (0xF8, 0),  # ExSel key
-    (0xF9, 222),  # Erase EOF key
-    (0xFA, 207),  # Play key
-    (0xFB, 0x174),  # Zoom key
-    (0xFC, 0),  # Reserved
-    (0xFD, 0x19B),  # PA1 key
-    (0xFE, 0x163),  # Clear key
-    (0xFF, 185),
-)
-
-MAC_EVENT_CODES = (
-    # NSLeftMouseDown Quartz.kCGEventLeftMouseDown
-    (1, ("Key", 0x110, 1, 589825)),
-    # NSLeftMouseUp Quartz.kCGEventLeftMouseUp
-    (2, ("Key", 0x110, 0, 589825)),
-    # NSRightMouseDown Quartz.kCGEventRightMouseDown
-    (3, ("Key", 0x111, 1, 589826)),
-    # NSRightMouseUp Quartz.kCGEventRightMouseUp
-    (4, ("Key", 0x111, 0, 589826)),
-    (5, (None, 0, 0, 0)),  # NSMouseMoved Quartz.kCGEventMouseMoved
-    (6, (None, 0, 0, 0)),  # NSLeftMouseDragged Quartz.kCGEventLeftMouseDragged
-    # NSRightMouseDragged Quartz.kCGEventRightMouseDragged
-    (7, (None, 0, 0, 0)),
-    (8, (None, 0, 0, 0)),  # NSMouseEntered
-    (9, (None, 0, 0, 0)),  # NSMouseExited
-    (10, (None, 0, 0, 0)),  # NSKeyDown
-    (11, (None, 0, 0, 0)),  # NSKeyUp
-    (12, (None, 0, 0, 0)),  # NSFlagsChanged
-    (13, (None, 0, 0, 0)),  # NSAppKitDefined
-    (14, (None, 0, 0, 0)),  # NSSystemDefined
-    (15, (None, 0, 0, 0)),  # NSApplicationDefined
-    (16, (None, 0, 0, 0)),  # NSPeriodic
-    (17, (None, 0, 0, 0)),  # NSCursorUpdate
-    (22, (None, 0, 0, 0)),  # NSScrollWheel Quartz.kCGEventScrollWheel
-    (23, (None, 0, 0, 0)),  # NSTabletPoint Quartz.kCGEventTabletPointer
-    (24, (None, 0, 0, 0)),  # NSTabletProximity Quartz.kCGEventTabletProximity
-    (25, (None, 0, 0, 0)),  # NSOtherMouseDown Quartz.kCGEventOtherMouseDown
-    (25.2, ("Key", 0x112, 1, 589827)),  # BTN_MIDDLE
-    (25.3, ("Key", 0x113, 1, 589828)),  # BTN_SIDE
-    (25.4, ("Key", 0x114, 1, 589829)),  # BTN_EXTRA
-    (26, (None, 0, 0, 0)),  # NSOtherMouseUp Quartz.kCGEventOtherMouseUp
-    (26.2, ("Key", 0x112, 0, 589827)),  # BTN_MIDDLE
-    (26.3, ("Key", 0x113, 0, 589828)),  # BTN_SIDE
-    (26.4, ("Key", 0x114, 0, 589829)),  # BTN_EXTRA
-    (27, (None, 0, 0, 0)),  # NSOtherMouseDragged
-    (29, (None, 0, 0, 0)),  # NSEventTypeGesture
-    (30, (None, 0, 0, 0)),  # NSEventTypeMagnify
-    (31, (None, 0, 0, 0)),  # NSEventTypeSwipe
-    (18, (None, 0, 0, 0)),  # NSEventTypeRotate
-    (19, (None, 0, 0, 0)),  # NSEventTypeBeginGesture
-    (20, (None, 0, 0, 0)),  # NSEventTypeEndGesture
-    (27, (None, 0, 0, 0)),  # Quartz.kCGEventOtherMouseDragged
-    (32, (None, 0, 0, 0)),  # NSEventTypeSmartMagnify
-    (33, (None, 0, 0, 0)),  # NSEventTypeQuickLook
-    (34, (None, 0, 0, 0)),  # NSEventTypePressure
-)
-
-MAC_KEYS = (
-    (0x00, 30),  # kVK_ANSI_A
-    (0x01, 31),  # kVK_ANSI_S    (0x02, 32),  # kVK_ANSI_D
-    (0x03, 33),  # kVK_ANSI_F
-    (0x04, 35),  # kVK_ANSI_H
-    (0x05, 34),  # kVK_ANSI_G
-    (0x06, 44),  # kVK_ANSI_Z
-    (0x07, 45),  # kVK_ANSI_X
-    (0x08, 46),  # kVK_ANSI_C
-    (0x09, 47),  # kVK_ANSI_V
-    (0x0B, 48),  # kVK_ANSI_B
-    (0x0C, 16),  # kVK_ANSI_Q
-    (0x0D, 17),  # kVK_ANSI_W
-    (0x0E, 18),  # kVK_ANSI_E
-    (0x0F, 33),  # kVK_ANSI_R
-    (0x10, 21),  # kVK_ANSI_Y
-    (0x11, 20),  # kVK_ANSI_T
-    (0x12, 2),  # kVK_ANSI_1
-    (0x13, 3),  # kVK_ANSI_2
-    (0x14, 4),  # kVK_ANSI_3
-    (0x15, 5),  # kVK_ANSI_4
-    (0x16, 7),  # kVK_ANSI_6
-    (0x17, 6),  # kVK_ANSI_5
-    (0x18, 13),  # kVK_ANSI_Equal
-    (0x19, 10),  # kVK_ANSI_9
-    (0x1A, 8),  # kVK_ANSI_7
-    (0x1B, 12),  # kVK_ANSI_Minus
-    (0x1C, 9),  # kVK_ANSI_8
-    (0x1D, 11),  # kVK_ANSI_0
-    (0x1E, 27),  # kVK_ANSI_RightBracket
-    (0x1F, 24),  # kVK_ANSI_O
-    (0x20, 22),  # kVK_ANSI_U
-    (0x21, 26),  # kVK_ANSI_LeftBracket
-    (0x22, 23),  # kVK_ANSI_I
-    (0x23, 25),  # kVK_ANSI_P
-    (0x25, 38),  # kVK_ANSI_L
-    (0x26, 36),  # kVK_ANSI_J
-    (0x27, 40),  # kVK_ANSI_Quote
-    (0x28, 37),  # kVK_ANSI_K
-    (0x29, 39),  # kVK_ANSI_Semicolon
-    (0x2A, 43),  # kVK_ANSI_Backslash
-    (0x2B, 51),  # kVK_ANSI_Comma
-    (0x2C, 53),  # kVK_ANSI_Slash
-    (0x2D, 49),  # kVK_ANSI_N
-    (0x2E, 50),  # kVK_ANSI_M
-    (0x2F, 52),  # kVK_ANSI_Period
-    (0x32, 41),  # kVK_ANSI_Grave
-    (0x41, 83),  # kVK_ANSI_KeypadDecimal
-    (0x43, 55),  # kVK_ANSI_KeypadMultiply
-    (0x45, 78),  # kVK_ANSI_KeypadPlus
-    (0x47, 69),  # kVK_ANSI_KeypadClear
-    (0x4B, 98),  # kVK_ANSI_KeypadDivide
-    (0x4C, 96),  # kVK_ANSI_KeypadEnter
-    (0x4E, 74),  # kVK_ANSI_KeypadMinus
-    (0x51, 117),  # kVK_ANSI_KeypadEquals
-    (0x52, 82),  # kVK_ANSI_Keypad0
-    (0x53, 79),  # kVK_ANSI_Keypad1
-    (0x54, 80),  # kVK_ANSI_Keypad2
-    (0x55, 81),  # kVK_ANSI_Keypad3
-    (0x56, 75),  # kVK_ANSI_Keypad4
-    (0x57, 76),  # kVK_ANSI_Keypad5
-    (0x58, 77),  # kVK_ANSI_Keypad6
-    (0x59, 71),  # kVK_ANSI_Keypad7
-    (0x5B, 72),  # kVK_ANSI_Keypad8
-    (0x5C, 73),  # kVK_ANSI_Keypad9
-    (0x24, 28),  # kVK_Return
-    (0x30, 15),  # kVK_Tab
-    (0x31, 57),  # kVK_Space
-    (0x33, 111),  # kVK_Delete
-    (0x35, 1),  # kVK_Escape
-    (0x37, 125),  # kVK_Command
-    (0x38, 42),  # kVK_Shift
-    (0x39, 58),  # kVK_CapsLock
-    (0x3A, 56),  # kVK_Option
-    (0x3B, 29),  # kVK_Control
-    (0x3C, 54),  # kVK_RightShift
-    (0x3D, 100),  # kVK_RightOption
-    (0x3E, 126),  # kVK_RightControl
-    (0x36, 126),  # Right Meta
-    (0x3F, 0x1D0),  # kVK_Function
-    (0x40, 187),  # kVK_F17
-    (0x48, 115),  # kVK_VolumeUp
-    (0x49, 114),  # kVK_VolumeDown
-    (0x4A, 113),  # kVK_Mute
-    (0x4F, 188),  # kVK_F18
-    (0x50, 189),  # kVK_F19
-    (0x5A, 190),  # kVK_F20
-    (0x60, 63),  # kVK_F5
-    (0x61, 64),  # kVK_F6
-    (0x62, 65),  # kVK_F7
-    (0x63, 61),  # kVK_F3
-    (0x64, 66),  # kVK_F8
-    (0x65, 67),  # kVK_F9
-    (0x67, 87),  # kVK_F11
-    (0x69, 183),  # kVK_F13
-    (0x6A, 186),  # kVK_F16
-    (0x6B, 184),  # kVK_F14
-    (0x6D, 68),  # kVK_F10
-    (0x6F, 88),  # kVK_F12
-    (0x71, 185),  # kVK_F15
-    (0x72, 138),  # kVK_Help
-    (0x73, 102),  # kVK_Home
-    (0x74, 104),  # kVK_PageUp
-    (0x75, 111),  # kVK_ForwardDelete
-    (0x76, 62),  # kVK_F4
-    (0x77, 107),  # kVK_End
-    (0x78, 60),  # kVK_F2
-    (0x79, 109),  # kVK_PageDown
-    (0x7A, 59),  # kVK_F1
-    (0x7B, 105),  # kVK_LeftArrow
-    (0x7C, 106),  # kVK_RightArrow
-    (0x7D, 108),  # kVK_DownArrow
-    (0x7E, 103),  # kVK_UpArrow
-    (0x0A, 170),  # kVK_ISO_Section
-    (0x5D, 124),  # kVK_JIS_Yen
-    (0x5E, 92),  # kVK_JIS_Underscore
-    (0x5F, 95),  # kVK_JIS_KeypadComma
-    (0x66, 94),  # kVK_JIS_Eisu
-    (0x68, 90),  # kVK_JIS_Kana
-)
-
-
 # We have yet to support force feedback but probably should
 # eventually:
 
@@ -1196,8 +805,7 @@ CURRENT = ()
 
 EVENT_MAP = (
     ("types", EVENT_TYPES),
-    ("type_codes", ((value, key) for key, value in EVENT_TYPES)),
-    ("wincodes", WINCODES),
+    ("type_codes", tuple((value, key) for key, value in EVENT_TYPES)),
     ("specials", SPECIAL_DEVICES),
     ("xpad", XINPUT_MAPPING),
     ("Sync", SYNCHRONIZATION_EVENTS),
@@ -1217,6 +825,32 @@ EVENT_MAP = (
     ("Current", CURRENT),
 )
 
+# Entries of DeviceManager.codes that are only made when first used,
+# and the platform table each one is made from.
+LAZY_EVENT_MAP = {"wincodes": "WINCODES"}
+
+PLATFORM_TABLES = {
+    "WIN_KEYBOARD_CODES": "_constants_win",
+    "WIN_MOUSE_CODES": "_constants_win",
+    "WINCODES": "_constants_win",
+    "MAC_EVENT_CODES": "_constants_mac",
+    "MAC_KEYS": "_constants_mac",
+}
+
+
+def __getattr__(name):
+    """Load a platform table the first time it is used."""
+    try:
+        module_name = PLATFORM_TABLES[name]
+    except KeyError:
+        raise AttributeError(
+            "module %r has no attribute %r" % (__name__, name)
+        ) from None
+    module = importlib.import_module("inputs." + module_name)
+    value = globals()[name] = getattr(module, name)
+    return value
+
+
 # Evdev style paths for the Mac
 
 APPKIT_KB_PATH = "/dev/input/by-id/usb-AppKit_Keyboard-event-kbd"
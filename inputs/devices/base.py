@@ -1,23 +1,116 @@
 """Base class for input devices."""
 
+from collections import namedtuple
+from contextlib import contextmanager
 from multiprocessing import Pipe, Process
 import os
 import io
-
-
-from ..libi.c import EVENT_SIZE, iter_unpack
+import select
+import struct
+
+
+from ..libi.c import (
+    EVENT_FORMAT,
+    EVENT_SIZE,
+    EventRingBuffer,
+    array_unpack,
+    event_dtype,
+    iter_unpack,
+)
 from ..libi.errors import NoDevicePath, PERMISSIONS_ERROR_TEXT
 from ..libi.system import NIX, WIN, MAC
-from ..libi.event import InputEvent
+from ..libi.event import Frame, InputEvent
+from ..libi import ioctl
+from ..libi.ioctl import EV_SYN, SYN_DROPPED, SYN_REPORT
+from ..libi.state import DeviceState
+from ..libi.capabilities import Capabilities
+from ..libi.mask import EventMask
+
+# How long (in seconds) each read waits when run in a worker thread.
+EXECUTOR_READ_TIMEOUT = 0.1
+
+# The event types whose state the kernel can be asked for, with the
+# ioctl request and highest code of each.
+RESYNC_BITMAPS = (
+    (ioctl.EV_KEY, ioctl.EVIOCGKEY, ioctl.KEY_MAX),
+    (ioctl.EV_LED, ioctl.EVIOCGLED, ioctl.LED_MAX),
+    (ioctl.EV_SW, ioctl.EVIOCGSW, ioctl.SW_MAX),
+)
+RESYNC_TYPES = frozenset(
+    [ev_type for ev_type, _, _ in RESYNC_BITMAPS] + [ioctl.EV_ABS]
+)
+
+# Raw modes, where reads give numbers rather than InputEvent objects.
+RAW_TUPLES = "tuples"
+RAW_NUMPY = "numpy"
+
+# Where a device's details are found in sysfs, under the manager's
+# sys_class directory.
+SYSFS_DEVICE_PATH = "%s/input/%s/device/%s"
+
+DeviceInfo = namedtuple(
+    "DeviceInfo", ["name", "bustype", "vendor", "product", "version", "phys", "uniq"]
+)
 
 
 class InputDevice(object):  # pylint: disable=useless-object-inheritance
-    """A user input device."""
+    """A user input device.
+
+    Each read drains up to read_size events that are already queued
+    for the device in a single system call, so a larger read_size lets
+    a burst of events be decoded together.
+
+    Pass blocking=False (or call set_blocking) to open the device in
+    non-blocking mode, where reads return straight away when there is
+    nothing to report.
+
+    Pass raw_mode (or call set_raw_mode) to have reads return the
+    numbers from each evdev event, (tv_sec, tv_usec, type, code,
+    value), instead of InputEvent objects. RAW_TUPLES gives a list of
+    tuples, RAW_NUMPY gives a NumPy structured array viewing the data
+    that was read.
+
+    Pass ring_slots to read into a preallocated ring of that many
+    buffers instead of allocating new bytes for every read. In
+    RAW_NUMPY mode the arrays then view the ring, so each is only
+    valid for the next ring_slots - 1 reads.
+
+    Pass track_state=True to keep a DeviceState in the state
+    attribute, updated as each batch of events is read, so the
+    current keys and axes can be asked for without going through the
+    events.
+
+    Pass snapshot=True to also fill that state from the kernel when
+    the device is opened (see snapshot), so keys held down before then
+    are known straight away.
+    """
 
     # pylint: disable=too-many-instance-attributes
-    def __init__(self, manager, device_path=None, char_path_override=None, read_size=1):
+    def __init__(
+        self,
+        manager,
+        device_path=None,
+        char_path_override=None,
+        read_size=1,
+        blocking=True,
+        raw_mode=None,
+        ring_slots=None,
+        track_state=False,
+        snapshot=False,
+    ):
+        # pylint: disable=too-many-arguments
         self.read_size = read_size
+        self.blocking = blocking
+        self.ring_slots = ring_slots
+        self._ring = None
+        self.raw_mode = None
+        self.set_raw_mode(raw_mode)
         self.manager = manager
+        if track_state or snapshot:
+            self.state = DeviceState(manager.get_event_code)
+        else:
+            self.state = None
+        self._snapshot_on_open = snapshot
         self.__pipe = None
         self._listener = None
         self.leds = None
@@ -44,6 +137,20 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
         self._evdev = False
         self._set_evdev_state()
 
+        # The last value seen for each key, LED, switch and axis, as
+        # (raw_type, raw_code): value, used to resync after SYN_DROPPED.
+        self._synced = {}
+
+        self._capabilities = None
+        self._info = None
+
+        # The events subscribed to, and the userspace filter used when
+        # the kernel can't do the filtering.
+        self._mask = None
+        self._filter = None
+
+        self._grabbed = False
+
         self.name = "Unknown Device"
         self._set_name()
 
@@ -58,15 +165,49 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
 
     def _set_name(self):
         if NIX:
-            with open(
-                "/sys/class/input/%s/device/name" % self.get_char_name()
-            ) as name_file:
-                self.name = name_file.read().strip()
+            self.name = self.manager.sysfs.read(self._get_sysfs_path("name"))
             self.leds = []
 
+    def _get_sysfs_path(self, name):
+        """Get the path of one of the device's sysfs files."""
+        return SYSFS_DEVICE_PATH % (self.manager.sys_class, self.get_char_name(), name)
+
+    def _read_sysfs(self, name):
+        """Read one of the device's sysfs files, or None if it can't be."""
+        try:
+            return self.manager.sysfs.read(self._get_sysfs_path(name))
+        except OSError:
+            return None
+
+    @property
+    def info(self):
+        """The DeviceInfo of the device: its name, the bus type,
+        vendor, product and version numbers, and its phys and uniq
+        strings.
+
+        The details are read from sysfs (on Linux) the first time
+        they are asked for, and then kept. Any that aren't known are
+        None.
+        """
+        if self._info is None:
+            if NIX:
+                numbers = []
+                for name in ("bustype", "vendor", "product", "version"):
+                    value = self._read_sysfs("id/" + name)
+                    numbers.append(None if value is None else int(value, 16))
+                self._info = DeviceInfo(
+                    self.name,
+                    *numbers,
+                    phys=self._read_sysfs("phys") or None,
+                    uniq=self._read_sysfs("uniq") or None,
+                )
+            else:
+                self._info = DeviceInfo(self.name, *([None] * 6))
+        return self._info
+
     def _get_path_infomation(self):
         """Get useful infomation from the device path."""
-        long_identifier = self._device_path.split("/")[4]
+        long_identifier = os.path.basename(self._device_path)
         protocol, remainder = long_identifier.split("-", 1)
         identifier, _, device_type = remainder.rsplit("-", 2)
         return (protocol, identifier, device_type)
@@ -99,7 +240,11 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
                 self._character_file = io.BytesIO()
                 return self._character_file
             try:
-                self._character_file = io.open(self._character_device_path, "rb")
+                # Unbuffered, so each read maps onto one read of the
+                # device and select never misses data hidden in a buffer.
+                self._character_file = io.open(
+                    self._character_device_path, "rb", buffering=0
+                )
             except PermissionError:
                 # Python 3
                 raise PermissionError(PERMISSIONS_ERROR_TEXT)
@@ -109,18 +254,227 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
                     raise PermissionError(PERMISSIONS_ERROR_TEXT)
                 else:
                     raise
+            if not self.blocking:
+                os.set_blocking(self._character_file.fileno(), False)
+            if self._mask is not None:
+                self._install_mask()
+            if self._snapshot_on_open:
+                self.snapshot()
 
         return self._character_file
 
+    @property
+    def capabilities(self):
+        """The Capabilities of the device, i.e. the event types and codes
+        it can send, or None if the kernel can't be asked.
+
+        This is asked for once and then kept.
+        """
+        if self._capabilities is None and self._evdev:
+            if self._character_file:
+                self._capabilities = Capabilities.from_fd(
+                    self._character_file.fileno()
+                )
+            else:
+                self._capabilities = Capabilities.from_path(
+                    self._character_device_path
+                )
+        return self._capabilities
+
+    def fileno(self):
+        """Get the file descriptor that signals when events are ready.
+
+        This is the evdev character device on Linux or the listener
+        pipe on other platforms.
+        """
+        if self._evdev:
+            return self._character_device.fileno()
+        pipe = self._pipe
+        if pipe:
+            return pipe.fileno()
+        raise io.UnsupportedOperation("%s has no file descriptor" % self)
+
+    def set_raw_mode(self, raw_mode):
+        """Choose what reads return, None for InputEvent objects,
+        RAW_TUPLES for tuples or RAW_NUMPY for a NumPy array."""
+        if raw_mode not in (None, RAW_TUPLES, RAW_NUMPY):
+            raise ValueError("Unknown raw mode %r" % raw_mode)
+        if raw_mode == RAW_NUMPY:
+            # Fail now, rather than on the first read, if numpy is missing
+            event_dtype()
+        self.raw_mode = raw_mode
+
+    def subscribe(self, events):
+        """Only receive the given events.
+
+        events maps each event type to the codes wanted, or to None for
+        all the codes of that type, e.g. {"Key": None} or {0x03: [0, 1]}.
+        Types and codes can be numbers or names. SYN events are always
+        received.
+
+        On Linux the mask is given to the kernel (EVIOCSMASK), so the
+        other events are never read at all. If the kernel can't do
+        that (before Linux 4.4), or on other platforms, the events are
+        filtered as they are decoded instead. Return True if the
+        kernel is doing the filtering.
+        """
+        numbers = {}
+        for ev_type, codes in events.items():
+            if not isinstance(ev_type, int):
+                ev_type = self.manager.get_typecode(ev_type)
+            if codes is not None:
+                codes = [
+                    code if isinstance(code, int) else self.manager.get_event_code(code)
+                    for code in codes
+                ]
+            numbers[ev_type] = codes
+        self._mask = EventMask(numbers)
+        return self._install_mask()
+
+    def unsubscribe(self):
+        """Receive every event again."""
+        if self._mask is None:
+            return
+        if self._filter is None and self._character_file:
+            # The kernel has the mask, give it one that passes everything.
+            self._mask = EventMask()
+            self._install_mask()
+        self._mask = self._filter = None
+
+    def _install_mask(self):
+        """Give the mask to the kernel, or filter in userspace if it
+        can't take it. Return True if the kernel took it."""
+        if self._evdev:
+            fd = self._character_device.fileno()
+            try:
+                for ev_type, bitmap in self._mask.bitmaps():
+                    ioctl.set_mask(fd, ev_type, bitmap)
+            except OSError:
+                pass
+            else:
+                self._filter = None
+                return True
+        self._filter = self._mask.accepts
+        return False
+
+    def grab(self):
+        """Take the device for ourselves, so its events no longer reach
+        other programs (such as X or Wayland) until ungrab() or close().
+
+        Raises OSError (EBUSY) if something else has grabbed it.
+        """
+        if not self._evdev:
+            raise NotImplementedError("Grabbing needs a Linux evdev device.")
+        ioctl.grab(self._character_device.fileno())
+        self._grabbed = True
+
+    def ungrab(self):
+        """Let other programs have the device's events again."""
+        if self._grabbed and self._character_file:
+            ioctl.grab(self._character_file.fileno(), False)
+        self._grabbed = False
+
+    @contextmanager
+    def grabbed(self):
+        """Grab the device for the duration of a with block."""
+        self.grab()
+        try:
+            yield self
+        finally:
+            self.ungrab()
+
+    def passthrough(self, sink, remap=None):
+        """Copy the device's events to sink until interrupted, usually
+        while the device is grabbed. sink is a file descriptor (or has a
+        fileno()) that takes evdev events, such as a uinput device.
+
+        remap(ev_type, code, value) is called with each event's numbers
+        and returns the numbers to write instead, or None to drop the
+        event. Events are copied a read at a time, with one write each.
+        """
+        sink_fd = sink if isinstance(sink, int) else sink.fileno()
+        for data in self._iter_data():
+            if self.state is not None:
+                self._update_state(data)
+            if remap is not None or self._filter is not None:
+                data = self._remap(data, remap)
+                if not data:
+                    continue
+            os.write(sink_fd, data)
+
+    def _remap(self, data, remap):
+        """Filter and remap raw data, returning the raw data to write."""
+        pack = struct.Struct(EVENT_FORMAT).pack
+        accepts = self._filter
+        remapped = bytearray()
+        for tv_sec, tv_usec, ev_type, code, value in iter_unpack(data):
+            if accepts is not None and not accepts(ev_type, code):
+                continue
+            if remap is not None:
+                event = remap(ev_type, code, value)
+                if event is None:
+                    continue
+                ev_type, code, value = event
+            remapped += pack(tv_sec, tv_usec, ev_type, code, value)
+        return remapped
+
+    def close(self):
+        """Close the character device, it is reopened when next read.
+        Closing it also releases any grab."""
+        if self._character_file:
+            self._character_file.close()
+            self._character_file = None
+        self._grabbed = False
+
+    def set_blocking(self, blocking):
+        """Choose whether reads wait for an event to arrive."""
+        self.blocking = blocking
+        if self._evdev and self._character_file:
+            os.set_blocking(self._character_file.fileno(), blocking)
+
     def __iter__(self):
         while True:
+            if not self.blocking:
+                # Sleep until there is data rather than spinning
+                self._wait_for_data(None)
             event = self._do_iter()
-            if event:
+            if event is not None:
                 yield event
 
     def _get_data(self, read_size):
         """Get data from the character device."""
-        return self._character_device.read(read_size)
+        if self.ring_slots and self._evdev:
+            return self._read_into_ring(read_size)
+        try:
+            return self._character_device.read(read_size)
+        except BlockingIOError:
+            return None
+
+    def _read_into_ring(self, read_size):
+        """Read from the character device into the next ring slot, return
+        a memoryview of the data."""
+        ring = self._ring
+        if not ring or ring.slot_size != read_size:
+            ring = self._ring = EventRingBuffer(read_size, self.ring_slots)
+        slot = ring.next_slot()
+        try:
+            count = self._character_device.readinto(slot)
+        except BlockingIOError:
+            return None
+        if not count:
+            return None
+        return slot[:count]
+
+    def _wait_for_data(self, timeout):
+        """Wait up to timeout seconds for the device to have events,
+        return True if there is something to read."""
+        if self._evdev:
+            ready, _, _ = select.select([self.fileno()], [], [], timeout)
+            return bool(ready)
+        pipe = self._pipe
+        if pipe:
+            return pipe.poll(timeout)
+        return True
 
     @staticmethod
     def _get_target_function():
@@ -141,26 +495,250 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
         data = self._get_data(read_size)
         if not data:
             return None
-        evdev_objects = iter_unpack(data)
-        events = [self._make_event(*event) for event in evdev_objects]
+        if self.state is not None:
+            self._update_state(data)
+        if self.raw_mode == RAW_NUMPY:
+            events = array_unpack(data)
+            if self._filter is not None:
+                accepts = self._filter
+                events = events[
+                    [
+                        accepts(ev_type, code)
+                        for ev_type, code in zip(events["type"], events["code"])
+                    ]
+                ]
+        elif self.raw_mode == RAW_TUPLES:
+            events = list(iter_unpack(data))
+            if self._filter is not None:
+                accepts = self._filter
+                events = [event for event in events if accepts(event[2], event[3])]
+        else:
+            events = self._make_events(data)
+        if not len(events):  # pylint: disable=len-as-condition
+            return None
+        return events
+
+    def _update_state(self, data):
+        """Apply the raw data to the state."""
+        update = self.state.update
+        for _, _, ev_type, code, value in iter_unpack(data):
+            update(ev_type, code, value)
+
+    def _make_events(self, data):
+        """Make InputEvent objects from the raw data."""
+        from_raw = InputEvent.from_raw
+        if self._filter is not None:
+            accepts = self._filter
+            return [
+                from_raw(self, *event)
+                for event in iter_unpack(data)
+                if accepts(event[2], event[3])
+            ]
+        return [from_raw(self, *event) for event in iter_unpack(data)]
+
+    def _iter_data(self):
+        """Yield the raw data from each read of the device."""
+        while True:
+            if not self.blocking:
+                self._wait_for_data(None)
+            data = self._get_data(self._get_total_read_size())
+            if data:
+                yield data
+
+    def frames(self):
+        """Yield a Frame for each SYN_REPORT, holding all the events in
+        that report.
+
+        When the kernel reports SYN_DROPPED, the partial frame and
+        everything up to the next SYN_REPORT is thrown away (as the
+        evdev documentation requires). In their place is a frame
+        marked as dropped, holding the synthetic events from resync().
+
+        Frames are always made of InputEvent objects, whatever the
+        raw_mode.
+        """
+        pending = []
+        dropped = False
+        for data in self._iter_data():
+            if self.state is not None:
+                self._update_state(data)
+            for event in self._make_events(data):
+                if event.raw_type != EV_SYN:
+                    pending.append(event)
+                elif event.raw_code == SYN_REPORT:
+                    if dropped:
+                        yield Frame(self, self.resync(event), event, dropped=True)
+                        dropped = False
+                    else:
+                        self._remember(pending)
+                        yield Frame(self, pending, event)
+                    pending = []
+                elif event.raw_code == SYN_DROPPED:
+                    pending = []
+                    dropped = True
+                else:
+                    pending.append(event)
+
+    def _remember(self, events):
+        """Keep the values of the events that resync() can check."""
+        synced = self._synced
+        for event in events:
+            if event.raw_type in RESYNC_TYPES:
+                synced[(event.raw_type, event.raw_code)] = event.state
+
+    def _get_kernel_state(self):
+        """Ask the kernel for the keys, LEDs and switches that are on
+        and the AbsInfo of each axis.
+
+        Return a dict of (raw_type, raw_code): value and a dict of
+        axis: AbsInfo.
+        """
+        fd = self._character_device.fileno()
+        current = {}
+        for ev_type, request, max_code in RESYNC_BITMAPS:
+            for code in ioctl.iter_bits(ioctl.get_bitmap(fd, request, max_code)):
+                current[(ev_type, code)] = 1
+        abs_info = {}
+        for axis in ioctl.iter_bits(ioctl.get_bits(fd, ioctl.EV_ABS, ioctl.ABS_MAX)):
+            abs_info[axis] = ioctl.get_abs_info(fd, axis)
+            current[(ioctl.EV_ABS, axis)] = abs_info[axis].value
+        return current, abs_info
+
+    def _set_state(self, current, abs_info):
+        """Replace the tracked state with the kernel's."""
+        state = self.state
+        state.clear()
+        for (ev_type, code), value in current.items():
+            state.update(ev_type, code, value)
+        state.abs_info.update(abs_info)
+
+    def snapshot(self):
+        """Fill the state from the kernel: the keys, LEDs and switches
+        that are on now, and the value and limits of each axis.
+
+        Only real evdev devices can be asked, on other devices the
+        state is left alone.
+        """
+        if self.state is None:
+            self.state = DeviceState(self.manager.get_event_code)
+        if not self._evdev:
+            return
+        current, abs_info = self._get_kernel_state()
+        self._set_state(current, abs_info)
+        self._synced = current
+
+    def resync(self, sync=None):
+        """Ask the kernel for the current key, LED, switch and axis
+        state, and return synthetic events for each value that differs
+        from the last one seen by frames().
+
+        The events take their time from the sync event if given, or
+        otherwise have a time of zero. Only real evdev devices can be
+        asked, other devices give no events. If the device tracks its
+        state, the state is replaced with the kernel's.
+        """
+        if not self._evdev:
+            return []
+        current, abs_info = self._get_kernel_state()
+        if self.state is not None:
+            self._set_state(current, abs_info)
+
+        # Keys, LEDs and switches that are now off have no bit set.
+        synced = self._synced
+        for key in synced:
+            if key[0] != ioctl.EV_ABS:
+                current.setdefault(key, 0)
+
+        if sync is None:
+            tv_sec = tv_usec = 0
+        else:
+            tv_sec, tv_usec = sync.tv_sec, sync.tv_usec
+        events = []
+        for (ev_type, code), value in sorted(current.items()):
+            if (ev_type, code) not in synced and value == 0:
+                continue
+            if synced.get((ev_type, code)) != value:
+                synced[(ev_type, code)] = value
+                events.append(
+                    InputEvent.from_raw(self, tv_sec, tv_usec, ev_type, code, value)
+                )
         return events
 
     # pylint: disable=too-many-arguments
     def _make_event(self, tv_sec, tv_usec, ev_type, code, value):
-        """Create a friendly Python object from an evdev style event."""
-        event_type = self.manager.get_event_type(ev_type)
-        eventinfo = {
-            "ev_type": event_type,
-            "state": value,
-            "timestamp": tv_sec + (tv_usec / 1000000),
-            "code": self.manager.get_event_string(event_type, code),
-        }
-
-        return InputEvent(self, eventinfo)
-
-    def read(self):
-        """Read the next input event."""
-        return next(iter(self))
+        """Create a friendly Python object from an evdev style event.
+
+        The names of the type and code are looked up when first used.
+        """
+        return InputEvent.from_raw(self, tv_sec, tv_usec, ev_type, code, value)
+
+    def read(self, timeout=None):
+        """Read the next input event.
+
+        With a timeout (in seconds), or on a non-blocking device,
+        return an empty list if no events arrive in time.
+        """
+        if timeout is None:
+            if self.blocking:
+                return next(iter(self))
+            timeout = 0
+        if not self._wait_for_data(timeout):
+            return []
+        events = self._do_iter()
+        return [] if events is None else events
+
+    async def aread(self):
+        """Read the next input events without blocking the event loop.
+
+        The device is only watched while a read is waiting, so events
+        queue up in the kernel (rather than in memory) if the caller
+        falls behind.
+        """
+        # Imported here as asyncio is slow to import and only needed
+        # by callers that already have it running.
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await self._wait_readable(loop)
+            except (io.UnsupportedOperation, NotImplementedError):
+                # E.g. the Windows proactor loop cannot watch a pipe.
+                return await self._aread_in_executor(loop)
+            events = self._do_iter()
+            if events is not None:
+                return events
+
+    async def aiter(self):
+        """Asynchronously iterate over the input events."""
+        while True:
+            yield await self.aread()
+
+    async def _wait_readable(self, loop):
+        """Wait until the event loop says the device can be read."""
+        fileno = self.fileno()
+        ready = loop.create_future()
+
+        def _set_ready():
+            loop.remove_reader(fileno)
+            if not ready.done():
+                ready.set_result(None)
+
+        loop.add_reader(fileno, _set_ready)
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fileno)
+
+    async def _aread_in_executor(self, loop):
+        """Read from a worker thread, a short wait at a time, so that a
+        cancelled read does not tie up the thread."""
+        while True:
+            events = await loop.run_in_executor(
+                None, self.read, EXECUTOR_READ_TIMEOUT
+            )
+            if len(events):
+                return events
 
     @property
     def _pipe(self):
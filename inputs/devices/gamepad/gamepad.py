@@ -30,8 +30,8 @@ if NIX:
 class GamePad(InputDevice):
     """A gamepad or other joystick-like device."""
 
-    def __init__(self, manager, device_path, char_path_override=None):
-        super().__init__(manager, device_path, char_path_override)
+    def __init__(self, manager, device_path, char_path_override=None, **kwargs):
+        super().__init__(manager, device_path, char_path_override, **kwargs)
         self._write_file = None
         self.__device_number = None
         if WIN:
@@ -67,10 +67,18 @@ class GamePad(InputDevice):
         while True:
             if WIN:
                 self.__check_state()
+            elif not self.blocking:
+                self._wait_for_data(None)
             event = self._do_iter()
-            if event:
+            if event is not None:
                 yield event
 
+    def _wait_for_data(self, timeout):
+        """On Windows, check the gamepad state before looking for data."""
+        if WIN:
+            self.__check_state()
+        return super()._wait_for_data(timeout)
+
     def __check_state(self):
         """On Windows, check the state and fill the event character device."""
         state = self.__read_device()
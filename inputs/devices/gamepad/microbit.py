@@ -33,13 +33,13 @@ SPIN_UP_MOTOR = (
 class MicroBitPad(GamePad):
     """A BBC Micro:bit flashed with bitio."""
 
-    def __init__(self, manager, device_path=None, char_path_override=None):
+    def __init__(self, manager, device_path=None, char_path_override=None, **kwargs):
         if not device_path:
             device_path = "/dev/input/by-id/dialup-BBC_MicroBit-event-joystick"
             if not char_path_override:
                 char_path_override = "/dev/input/microbit0"
 
-        super().__init__(manager, device_path, char_path_override)
+        super().__init__(manager, device_path, char_path_override, **kwargs)
         self._import_microbit()
         self._setup_rumble()
         self.set_display()
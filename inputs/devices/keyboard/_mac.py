@@ -1,6 +1,6 @@
 """Keep all the Mac keyboard wrapped so the Python coder doesn't have to care about Objective C."""
 
-from ...constants import MAC_KEYS
+from ... import constants
 from ...libi.baselistener import BaseListener
 
 
@@ -8,7 +8,9 @@ class AppKitKeyboardListener(BaseListener):
     """Emulate an evdev keyboard on the Mac."""
 
     def __init__(self, pipe):
-        super(AppKitKeyboardListener, self).__init__(pipe, codes=dict(MAC_KEYS))
+        super(AppKitKeyboardListener, self).__init__(
+            pipe, codes=dict(constants.MAC_KEYS)
+        )
 
     @staticmethod
     def _get_event_key_code(event):
@@ -2,7 +2,7 @@
 
 import ctypes
 
-from ...constants import WIN_KEYBOARD_CODES
+from ... import constants
 from ...libi.baselistener import BaseListener
 from ...libi.c import DWORD, LPARAM, MSG, WPARAM
 
@@ -69,7 +69,7 @@ class WindowsKeyboardListener(BaseListener):
 
     def handle_input(self, ncode, wparam, lparam):
         """Process the key input."""
-        value = WIN_KEYBOARD_CODES[wparam]
+        value = constants.WIN_KEYBOARD_CODES[wparam]
         scan_code = lparam.contents.scan_code
         vk_code = lparam.contents.vk_code
         self.update_timeval()
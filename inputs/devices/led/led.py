@@ -19,6 +19,7 @@ class LED:
         self.name = name
         self._write_file = None
         self._character_device_path = None
+        self._max_brightness = None
         self._post_init()
 
     def _post_init(self):
@@ -32,7 +33,11 @@ class LED:
         return '%s.%s("%s")' % (self.__module__, self.__class__.__name__, self.path)
 
     def status(self):
-        """Get the device status, i.e. the brightness level."""
+        """Get the device status, i.e. the brightness level.
+
+        This is read every time, as it can be changed at any time
+        (e.g. by pressing caps lock).
+        """
         status_filename = os.path.join(self.path, "brightness")
         with open(status_filename) as status_fp:
             result = status_fp.read()
@@ -44,7 +49,15 @@ class LED:
         return status
 
     def max_brightness(self):
-        """Get the device's maximum brightness level."""
+        """Get the device's maximum brightness level.
+
+        This can't change, so it is only read the first time.
+        """
+        if self._max_brightness is None:
+            self._max_brightness = self._read_max_brightness()
+        return self._max_brightness
+
+    def _read_max_brightness(self):
         status_filename = os.path.join(self.path, "max_brightness")
         with open(status_filename) as status_fp:
             result = status_fp.read()
@@ -106,7 +119,9 @@ class SystemLED(LED):
                 print("Failed with", self.name)
                 raise
             else:
-                self._character_device_path = "/dev/input/event" + event_number
+                self._character_device_path = os.path.join(
+                    self.manager.dev_input, "event" + event_number
+                )
                 self._match_device()
 
     def on(self):  # pylint: disable=invalid-name
@@ -1,6 +1,6 @@
 """Keep all the Mac mouse wrapped so the Python coder doesn't have to care about Objective C."""
 
-from ...constants import MAC_EVENT_CODES
+from ... import constants
 from ...libi.baselistener import BaseListener
 
 
@@ -8,7 +8,9 @@ class QuartzMouseBaseListener(BaseListener):
     """Emulate evdev mouse behaviour on mac."""
 
     def __init__(self, pipe):
-        super(QuartzMouseBaseListener, self).__init__(pipe, codes=dict(MAC_EVENT_CODES))
+        super(QuartzMouseBaseListener, self).__init__(
+            pipe, codes=dict(constants.MAC_EVENT_CODES)
+        )
         self.active = True
         self.events = []
 
@@ -214,7 +216,7 @@ class AppKitMouseBaseListener(BaseListener):
 
     def __init__(self, pipe, events=None):
         super(AppKitMouseBaseListener, self).__init__(
-            pipe, events, codes=dict(MAC_EVENT_CODES)
+            pipe, events, codes=dict(constants.MAC_EVENT_CODES)
         )
 
     @staticmethod
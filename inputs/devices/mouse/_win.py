@@ -2,7 +2,7 @@
 
 import ctypes
 
-from ...constants import WIN_MOUSE_CODES
+from ... import constants
 from ...libi.baselistener import BaseListener
 from ...libi.c import DWORD, LPARAM, MSG, WPARAM
 
@@ -37,7 +37,7 @@ class WindowsMouseListener(BaseListener):
         self.pipe = pipe
         self.hooked = None
         self.pointer = None
-        self.mouse_codes = WIN_MOUSE_CODES
+        self.mouse_codes = constants.WIN_MOUSE_CODES
         super().__init__(pipe)
 
     @staticmethod
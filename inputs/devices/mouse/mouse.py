@@ -35,6 +35,8 @@ class Mouse(InputDevice):
         """Get data from the character device."""
         if NIX:
             return super()._get_data(read_size)
+        if not self.blocking and not self._pipe.poll():
+            return None
         return self._pipe.recv_bytes()
 
 
@@ -0,0 +1,214 @@
+"""Virtual input devices, made with Linux's uinput."""
+
+import os
+import struct
+
+from ...libi import ioctl
+from ...libi.c import EVENT_FORMAT
+from ...libi.errors import PERMISSIONS_ERROR_TEXT
+from ...libi.ioctl import EV_ABS, EV_KEY, EV_REL, EV_SYN, SYN_REPORT, AbsInfo
+from ...libi.system import NIX
+
+UINPUT_PATH = "/dev/uinput"
+
+BUS_VIRTUAL = 0x06
+
+# struct uinput_user_dev: name, struct input_id (bustype, vendor,
+# product, version), ff_effects_max, then absmax, absmin, absfuzz and
+# absflat for every axis.
+UINPUT_MAX_NAME_SIZE = 80
+ABS_CNT = ioctl.ABS_MAX + 1
+UINPUT_USER_DEV_FORMAT = str("%dsHHHHI%di" % (UINPUT_MAX_NAME_SIZE, 4 * ABS_CNT))
+
+EVENT_STRUCT = struct.Struct(EVENT_FORMAT)
+
+# The events of the ready-made devices.
+KEYBOARD_EVENTS = {EV_KEY: range(1, 0x100)}
+# BTN_LEFT to BTN_EXTRA; REL_X, REL_Y, REL_HWHEEL and REL_WHEEL.
+MOUSE_EVENTS = {EV_KEY: range(0x110, 0x115), EV_REL: (0x00, 0x01, 0x06, 0x08)}
+# BTN_SOUTH to BTN_THUMBR; the sticks, the triggers and the hat.
+STICK = AbsInfo(0, -32768, 32767, 16, 128, 0)
+TRIGGER = AbsInfo(0, 0, 255, 0, 0, 0)
+HAT = AbsInfo(0, -1, 1, 0, 0, 0)
+GAMEPAD_ABS_INFO = {
+    0x00: STICK,
+    0x01: STICK,
+    0x02: TRIGGER,
+    0x03: STICK,
+    0x04: STICK,
+    0x05: TRIGGER,
+    0x10: HAT,
+    0x11: HAT,
+}
+GAMEPAD_EVENTS = {EV_KEY: range(0x130, 0x13F), EV_ABS: sorted(GAMEPAD_ABS_INFO)}
+
+
+class VirtualDevice(object):  # pylint: disable=useless-object-inheritance
+    """A device that the kernel treats as real, whose events are the
+    ones written to it. It shows up as a new /dev/input/event device,
+    so other programs (and DeviceManager) can read it.
+
+    events maps each event type to the codes the device can send,
+    e.g. {"Key": ["KEY_A", "KEY_B"]} or {0x02: [0, 1]}. Types and codes
+    can be numbers or names, the names are looked up by manager (the
+    shared one, if not given). abs_info maps each absolute axis to an
+    AbsInfo giving its range.
+
+    The device is removed by close(), or at the end of a with block.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        events,
+        name="inputs virtual device",
+        bustype=BUS_VIRTUAL,
+        vendor=0,
+        product=0,
+        version=1,
+        abs_info=None,
+        manager=None,
+        path=UINPUT_PATH,
+    ):
+        if not NIX:
+            raise NotImplementedError("Virtual devices need Linux's uinput.")
+        self.name = name
+        self.events = self._get_numbers(events, manager)
+        self.abs_info = abs_info or {}
+        self._id = (bustype, vendor, product, version)
+        self._fd = None
+        self._create(path)
+
+    @classmethod
+    def keyboard(cls, name="inputs virtual keyboard", **kwargs):
+        """Make a virtual keyboard with all the usual keys."""
+        return cls(KEYBOARD_EVENTS, name, **kwargs)
+
+    @classmethod
+    def mouse(cls, name="inputs virtual mouse", **kwargs):
+        """Make a virtual mouse with five buttons and two wheels."""
+        return cls(MOUSE_EVENTS, name, **kwargs)
+
+    @classmethod
+    def gamepad(cls, name="inputs virtual gamepad", **kwargs):
+        """Make a virtual gamepad with two sticks, two triggers, a hat
+        and the usual buttons."""
+        kwargs.setdefault("abs_info", GAMEPAD_ABS_INFO)
+        return cls(GAMEPAD_EVENTS, name, **kwargs)
+
+    @classmethod
+    def from_device(cls, device, name=None, **kwargs):
+        """Make a virtual device that can send the same events as an
+        evdev device, e.g. to pass on a grabbed device's events."""
+        capabilities = device.capabilities
+        if capabilities is None:
+            raise ValueError("The events %s can send are not known." % device)
+        events = {
+            ev_type: capabilities.event_codes(ev_type)
+            for ev_type in ioctl.iter_bits(capabilities.types)
+            if ev_type != EV_SYN
+        }
+        fd = device.fileno()
+        kwargs.setdefault(
+            "abs_info",
+            {axis: ioctl.get_abs_info(fd, axis) for axis in events.get(EV_ABS, ())},
+        )
+        info = device.info
+        for field in ("bustype", "vendor", "product", "version"):
+            if getattr(info, field) is not None:
+                kwargs.setdefault(field, getattr(info, field))
+        return cls(events, name or "%s (virtual)" % device.name, **kwargs)
+
+    @staticmethod
+    def _get_numbers(events, manager):
+        """Turn any type and code names into numbers."""
+        if manager is None:
+            # pylint: disable=import-outside-toplevel
+            from ...utils import devices as manager
+        numbers = {}
+        for ev_type, codes in events.items():
+            if not isinstance(ev_type, int):
+                ev_type = manager.get_typecode(ev_type)
+            numbers[ev_type] = [
+                code if isinstance(code, int) else manager.get_event_code(code)
+                for code in codes
+            ]
+        return numbers
+
+    def _get_user_dev(self):
+        """Pack the struct uinput_user_dev that describes the device."""
+        axes = [0] * (4 * ABS_CNT)
+        for axis, info in self.abs_info.items():
+            axes[axis] = info.maximum
+            axes[ABS_CNT + axis] = info.minimum
+            axes[2 * ABS_CNT + axis] = info.fuzz
+            axes[3 * ABS_CNT + axis] = info.flat
+        return struct.pack(
+            UINPUT_USER_DEV_FORMAT,
+            self.name.encode("utf-8")[: UINPUT_MAX_NAME_SIZE - 1],
+            *self._id,
+            0,
+            *axes,
+        )
+
+    def _create(self, path):
+        """Open uinput, set the device up and create it."""
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        except PermissionError as exc:
+            raise PermissionError(PERMISSIONS_ERROR_TEXT) from exc
+        try:
+            for ev_type, codes in sorted(self.events.items()):
+                ioctl.uinput_enable(fd, EV_SYN, ev_type)
+                if ev_type in ioctl.UI_SET_BIT_NUMBERS:
+                    for code in codes:
+                        ioctl.uinput_enable(fd, ev_type, code)
+            os.write(fd, self._get_user_dev())
+            ioctl.uinput_create(fd)
+        except OSError:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def fileno(self):
+        """Get the uinput file descriptor, e.g. for passthrough()."""
+        return self._fd
+
+    def write_events(self, events, syn=True):
+        """Send events, given as (ev_type, code, value) tuples of
+        numbers, all in one write. A SYN_REPORT is added to the end
+        unless syn is False. Return the number of events written.
+
+        The kernel gives the events their timestamps. If a batch is
+        bigger than a reader's buffer, the reader gets SYN_DROPPED.
+        """
+        pack = EVENT_STRUCT.pack
+        data = bytearray()
+        for ev_type, code, value in events:
+            data += pack(0, 0, ev_type, code, value)
+        if syn:
+            data += pack(0, 0, EV_SYN, SYN_REPORT, 0)
+        os.write(self._fd, data)
+        return len(data) // EVENT_STRUCT.size
+
+    def close(self):
+        """Remove the device."""
+        if self._fd is not None:
+            try:
+                ioctl.uinput_destroy(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return '%s.%s("%s")' % (
+            self.__class__.__module__,
+            self.__class__.__name__,
+            self.name,
+        )
@@ -0,0 +1,119 @@
+"""Noticing input devices being plugged in and unplugged, on Linux."""
+
+import fnmatch
+import os
+import select
+import threading
+
+from .libi import inotify
+from .libi.system import NIX
+
+DEV_INPUT = "/dev/input"
+
+# The directories of symlinks that DeviceManager finds devices in.
+LINK_DIRS = ("by-id", "by-path")
+LINK_PATTERN = "*-event-*"
+
+ADDED = inotify.IN_CREATE | inotify.IN_MOVED_TO
+REMOVED = inotify.IN_DELETE | inotify.IN_MOVED_FROM
+
+
+class HotplugMonitor(object):  # pylint: disable=useless-object-inheritance
+    """Watch /dev/input with inotify and keep a DeviceManager up to
+    date, adding devices as their symlinks appear and removing (and
+    closing) them as their symlinks go.
+
+    on_add and on_remove are called with each device that is added or
+    removed. Call process() from your own loop (fileno() can be used
+    with select), or start() to do it in a background thread, in
+    which case the callbacks are called from that thread.
+    """
+
+    def __init__(self, manager, on_add=None, on_remove=None, dev_input=DEV_INPUT):
+        if not NIX:
+            raise NotImplementedError("Hotplug monitoring needs Linux's inotify.")
+        self.manager = manager
+        self.on_add = on_add
+        self.on_remove = on_remove
+        self.dev_input = dev_input
+        self._inotify = inotify.Inotify()
+        self._thread = None
+        self._stopping = threading.Event()
+        self._inotify.add_watch(dev_input, ADDED)
+        for link_dir in LINK_DIRS:
+            path = os.path.join(dev_input, link_dir)
+            if os.path.isdir(path):
+                self._inotify.add_watch(path, ADDED | REMOVED)
+
+    def fileno(self):
+        """Get the file descriptor that is readable when there are changes."""
+        return self._inotify.fileno()
+
+    def process(self, timeout=0):
+        """Apply any waiting changes to the manager, waiting up to
+        timeout seconds (None is forever) for there to be some.
+
+        Return a list of ("add", device) and ("remove", device) pairs.
+        """
+        if not select.select([self._inotify], [], [], timeout)[0]:
+            return []
+        changes = []
+        for path, mask, name in self._inotify.read():
+            if path == self.dev_input:
+                if name in LINK_DIRS and mask & ADDED:
+                    changes.extend(self._watch_link_dir(os.path.join(path, name)))
+            elif fnmatch.fnmatch(name, LINK_PATTERN):
+                device_path = os.path.join(path, name)
+                if mask & ADDED:
+                    changes.extend(self._added(device_path))
+                elif mask & REMOVED:
+                    changes.extend(self._removed(device_path))
+        return changes
+
+    def _watch_link_dir(self, path):
+        """Watch a new directory of symlinks, and add the devices that
+        appeared in it before it was watched."""
+        self._inotify.add_watch(path, ADDED | REMOVED)
+        changes = []
+        for name in sorted(os.listdir(path)):
+            if fnmatch.fnmatch(name, LINK_PATTERN):
+                changes.extend(self._added(os.path.join(path, name)))
+        return changes
+
+    def _added(self, device_path):
+        # pylint: disable=protected-access
+        device = self.manager._add_device(device_path)
+        if device is None:
+            return []
+        if self.on_add:
+            self.on_add(device)
+        return [("add", device)]
+
+    def _removed(self, device_path):
+        # pylint: disable=protected-access
+        device = self.manager._remove_device(device_path)
+        if device is None:
+            return []
+        if self.on_remove:
+            self.on_remove(device)
+        return [("remove", device)]
+
+    def start(self):
+        """Process changes in a background thread until stop() is called."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self.process(0.5)
+
+    def stop(self):
+        """Stop the background thread, if there is one, and stop watching."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._inotify.close()
@@ -1,6 +1,7 @@
 """Dealing with the low-level input event structures."""
 
 import ctypes
+import functools
 import struct
 import math
 
@@ -41,6 +42,58 @@ def iter_unpack(raw):
     return struct.iter_unpack(EVENT_FORMAT, raw)
 
 
+class EventRingBuffer:
+    """A preallocated buffer for reading events into, one slot at a
+    time, so that reading does not allocate a new bytes object.
+
+    Data read into a slot stays valid until the ring comes back round
+    to that slot, i.e. for the next slots - 1 reads.
+    """
+
+    def __init__(self, slot_size, slots=4):
+        self.slot_size = slot_size
+        self.slots = slots
+        self._buffer = bytearray(slot_size * slots)
+        self._view = memoryview(self._buffer)
+        self._next = 0
+
+    def next_slot(self):
+        """Get a writable view of the next slot."""
+        start = self._next * self.slot_size
+        self._next = (self._next + 1) % self.slots
+        return self._view[start : start + self.slot_size]
+
+
+@functools.lru_cache(maxsize=None)
+def event_dtype():
+    """Get a NumPy structured dtype with the same layout as EVENT_FORMAT."""
+    try:
+        # pylint: disable=import-outside-toplevel
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "The numpy module is not installed, please install it."
+        ) from exc
+    return numpy.dtype(
+        [
+            ("tv_sec", "l"),
+            ("tv_usec", "l"),
+            ("type", "H"),
+            ("code", "H"),
+            ("value", "i"),
+        ],
+        align=True,
+    )
+
+
+def array_unpack(raw):
+    """View raw event data as a NumPy structured array, without copying."""
+    # pylint: disable=import-outside-toplevel
+    import numpy
+
+    return numpy.frombuffer(raw, dtype=event_dtype())
+
+
 def convert_timeval(seconds_since_epoch):
     """Convert time into C style timeval."""
     frac, whole = math.modf(seconds_since_epoch)
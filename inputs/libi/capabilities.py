@@ -0,0 +1,97 @@
+"""Finding out which events a device can send, using EVIOCGBIT."""
+
+import os
+
+from . import ioctl
+
+# The highest code of each event type, from input-event-codes.h. The
+# codes of EV_SYN can't be asked for, as EVIOCGBIT(0) gives the types.
+EV_MAX = 0x1F
+MAX_CODES = {
+    ioctl.EV_KEY: ioctl.KEY_MAX,
+    ioctl.EV_REL: 0x0F,
+    ioctl.EV_ABS: ioctl.ABS_MAX,
+    ioctl.EV_MSC: 0x07,
+    ioctl.EV_SW: ioctl.SW_MAX,
+    ioctl.EV_LED: ioctl.LED_MAX,
+    ioctl.EV_SND: 0x07,
+    ioctl.EV_REP: 0x01,
+    ioctl.EV_FF: 0x7F,
+}
+
+# Codes that show what sort of device it is.
+KEY_A = 30
+KEY_Z = 44
+BTN_LEFT = 0x110
+BTN_JOYSTICK = 0x120
+BTN_GAMEPAD = 0x130
+REL_X = 0x00
+ABS_X = 0x00
+
+
+class Capabilities:
+    """The event types and codes a device can send, as bitmaps with
+    the same layout as the kernel's, so each check is a single index
+    operation."""
+
+    __slots__ = ("types", "codes")
+
+    def __init__(self, types, codes):
+        self.types = types
+        self.codes = codes
+
+    @classmethod
+    def from_fd(cls, fd):
+        """Ask the kernel what the evdev device open as fd can send."""
+        types = ioctl.get_bits(fd, 0, EV_MAX)
+        codes = {}
+        for ev_type in ioctl.iter_bits(types):
+            if ev_type in MAX_CODES:
+                codes[ev_type] = ioctl.get_bits(fd, ev_type, MAX_CODES[ev_type])
+        return cls(types, codes)
+
+    @classmethod
+    def from_path(cls, path):
+        """Ask the kernel what the evdev device at path can send."""
+        fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            return cls.from_fd(fd)
+        finally:
+            os.close(fd)
+
+    def __repr__(self):
+        return "<Capabilities %s>" % ", ".join(
+            "%#x: %d codes" % (ev_type, len(list(ioctl.iter_bits(bitmap))))
+            for ev_type, bitmap in sorted(self.codes.items())
+        )
+
+    def has(self, ev_type, code=None):
+        """Can the device send this event type, and code if given?"""
+        if code is None:
+            bitmap = self.types
+            code = ev_type
+        else:
+            bitmap = self.codes.get(ev_type)
+            if bitmap is None:
+                return False
+        try:
+            return bool(bitmap[code >> 3] & (1 << (code & 7)))
+        except IndexError:
+            return False
+
+    def event_codes(self, ev_type):
+        """Get all the codes of an event type that the device can send."""
+        return list(ioctl.iter_bits(self.codes.get(ev_type, b"")))
+
+    def classify(self):
+        """Guess the device type, as in the device path suffixes: "kbd",
+        "mouse" or "joystick", or None if it looks like none of them."""
+        if self.has(ioctl.EV_ABS, ABS_X) and (
+            self.has(ioctl.EV_KEY, BTN_GAMEPAD) or self.has(ioctl.EV_KEY, BTN_JOYSTICK)
+        ):
+            return "joystick"
+        if self.has(ioctl.EV_REL, REL_X) and self.has(ioctl.EV_KEY, BTN_LEFT):
+            return "mouse"
+        if self.has(ioctl.EV_KEY, KEY_A) and self.has(ioctl.EV_KEY, KEY_Z):
+            return "kbd"
+        return None
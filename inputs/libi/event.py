@@ -2,12 +2,125 @@
 
 
 class InputEvent:
-    """A user event."""
+    """A user event.
+
+    Events read from a device keep the raw evdev numbers (raw_type,
+    raw_code, tv_sec and tv_usec). The ev_type and code names, and the
+    timestamp, are only worked out when they are first asked for, so
+    code that filters on the raw numbers never pays for them.
+    """
+
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    __slots__ = (
+        "device",
+        "state",
+        "tv_sec",
+        "tv_usec",
+        "raw_type",
+        "raw_code",
+        "_ev_type",
+        "_code",
+        "_timestamp",
+    )
 
-    # pylint: disable=too-few-public-methods
     def __init__(self, device, event_info):
         self.device = device
-        self.timestamp = event_info["timestamp"]
-        self.code = event_info["code"]
         self.state = event_info["state"]
-        self.ev_type = event_info["ev_type"]
+        self.tv_sec = self.tv_usec = self.raw_type = self.raw_code = None
+        self._timestamp = event_info["timestamp"]
+        self._code = event_info["code"]
+        self._ev_type = event_info["ev_type"]
+
+    @classmethod
+    def from_raw(cls, device, tv_sec, tv_usec, ev_type, code, value):
+        """Make an event straight from the numbers in an evdev event."""
+        # pylint: disable=too-many-arguments
+        event = cls.__new__(cls)
+        event.device = device
+        event.state = value
+        event.tv_sec = tv_sec
+        event.tv_usec = tv_usec
+        event.raw_type = ev_type
+        event.raw_code = code
+        event._ev_type = event._code = event._timestamp = None
+        return event
+
+    def _resolve_names(self):
+        """Look up the names of the raw type and code."""
+        self._ev_type, self._code = self.device.manager.get_event_names(
+            self.raw_type, self.raw_code
+        )
+
+    @property
+    def ev_type(self):
+        """The name of the event type, e.g. Key."""
+        if self._ev_type is None:
+            self._resolve_names()
+        return self._ev_type
+
+    @ev_type.setter
+    def ev_type(self, value):
+        self._ev_type = value
+
+    @property
+    def code(self):
+        """The name of the event code, e.g. KEY_A."""
+        if self._code is None:
+            self._resolve_names()
+        return self._code
+
+    @code.setter
+    def code(self, value):
+        self._code = value
+
+    @property
+    def timestamp(self):
+        """The time of the event in seconds since the epoch."""
+        if self._timestamp is None:
+            self._timestamp = self.tv_sec + (self.tv_usec / 1000000)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._timestamp = value
+
+
+class Frame:
+    """All the events of one evdev report, i.e. everything up to and
+    including a SYN_REPORT, which should be treated as happening at once.
+
+    If dropped is True, the kernel dropped events before this frame,
+    so anything remembered from earlier frames may be out of date.
+    """
+
+    # pylint: disable=too-few-public-methods
+    __slots__ = ("device", "events", "sync", "dropped")
+
+    def __init__(self, device, events, sync=None, dropped=False):
+        self.device = device
+        self.events = events
+        self.sync = sync
+        self.dropped = dropped
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __len__(self):
+        return len(self.events)
+
+    def __repr__(self):
+        return "<Frame of %d events%s>" % (
+            len(self.events),
+            ", after dropped events" if self.dropped else "",
+        )
+
+    @property
+    def timestamp(self):
+        """The time of the SYN_REPORT that ended the frame."""
+        if self.sync is None:
+            return None
+        return self.sync.timestamp
+
+    def changes(self):
+        """Get the final value of each (raw_type, raw_code) in the frame."""
+        return {(event.raw_type, event.raw_code): event.state for event in self.events}
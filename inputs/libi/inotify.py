@@ -0,0 +1,113 @@
+"""Watching directories for changes with Linux's inotify, using ctypes."""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+
+# Events, from sys/inotify.h
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+# struct inotify_event: wd, mask, cookie, len, then len bytes of name
+INOTIFY_EVENT_FORMAT = str("iIII")
+INOTIFY_EVENT_SIZE = struct.calcsize(INOTIFY_EVENT_FORMAT)
+
+# Enough for a burst of events with names up to NAME_MAX.
+READ_SIZE = 64 * (INOTIFY_EVENT_SIZE + 256)
+
+_LIBC = None
+
+
+def _libc():
+    """Load the C library the first time it is needed."""
+    global _LIBC  # pylint: disable=global-statement
+    if _LIBC is None:
+        _LIBC = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        _LIBC.inotify_init1.argtypes = [ctypes.c_int]
+        _LIBC.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        _LIBC.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return _LIBC
+
+
+def _check(result):
+    """Raise an OSError if a libc call failed."""
+    if result < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    return result
+
+
+def parse_events(data):
+    """Yield (wd, mask, cookie, name) for each event in data."""
+    offset = 0
+    while offset + INOTIFY_EVENT_SIZE <= len(data):
+        wd, mask, cookie, length = struct.unpack_from(
+            INOTIFY_EVENT_FORMAT, data, offset
+        )
+        offset += INOTIFY_EVENT_SIZE
+        name = bytes(data[offset : offset + length]).rstrip(b"\0")
+        offset += length
+        yield wd, mask, cookie, os.fsdecode(name)
+
+
+class Inotify(object):  # pylint: disable=useless-object-inheritance
+    """An inotify instance, which is a non-blocking file descriptor
+    that becomes readable when something happens in a watched
+    directory."""
+
+    def __init__(self):
+        self.fd = _check(_libc().inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+        self.watches = {}
+
+    def fileno(self):
+        """Get the inotify file descriptor."""
+        return self.fd
+
+    def add_watch(self, path, mask):
+        """Watch a directory, return the watch descriptor."""
+        wd = _check(_libc().inotify_add_watch(self.fd, os.fsencode(path), mask))
+        self.watches[wd] = path
+        return wd
+
+    def rm_watch(self, wd):
+        """Stop watching a directory."""
+        self.watches.pop(wd, None)
+        _check(_libc().inotify_rm_watch(self.fd, wd))
+
+    def read(self):
+        """Get (path, mask, name) for each event that is waiting, the
+        path being the directory that was watched."""
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return []
+        events = []
+        for wd, mask, _, name in parse_events(data):
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            path = self.watches.get(wd)
+            if path is not None:
+                events.append((path, mask, name))
+        return events
+
+    def close(self):
+        """Close the inotify file descriptor."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+            self.watches = {}
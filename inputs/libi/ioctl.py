@@ -0,0 +1,229 @@
+"""Asking evdev devices about their state with ioctl calls.
+
+The request numbers are built the same way as the _IOC macros in
+linux/ioctl.h and linux/input.h.
+"""
+
+from collections import namedtuple
+import ctypes
+import struct
+
+from .system import WIN
+
+if not WIN:
+    # pylint: disable=wrong-import-position
+    import fcntl
+
+# The layout of the request numbers, from asm-generic/ioctl.h
+IOC_NRBITS = 8
+IOC_TYPEBITS = 8
+IOC_SIZEBITS = 14
+
+IOC_NRSHIFT = 0
+IOC_TYPESHIFT = IOC_NRSHIFT + IOC_NRBITS
+IOC_SIZESHIFT = IOC_TYPESHIFT + IOC_TYPEBITS
+IOC_DIRSHIFT = IOC_SIZESHIFT + IOC_SIZEBITS
+
+IOC_NONE = 0
+IOC_WRITE = 1
+IOC_READ = 2
+
+# Event types, from input-event-codes.h
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_REL = 0x02
+EV_ABS = 0x03
+EV_MSC = 0x04
+EV_SW = 0x05
+EV_LED = 0x11
+EV_SND = 0x12
+EV_REP = 0x14
+EV_FF = 0x15
+
+SYN_REPORT = 0x00
+SYN_DROPPED = 0x03
+
+KEY_MAX = 0x2FF
+ABS_MAX = 0x3F
+SW_MAX = 0x10
+LED_MAX = 0x0F
+
+INT_SIZE = struct.calcsize(str("i"))
+
+# struct input_mask: type, codes_size, codes_ptr
+INPUT_MASK_FORMAT = str("IIQ")
+INPUT_MASK_SIZE = struct.calcsize(INPUT_MASK_FORMAT)
+
+# The uinput request number that enables the codes of each event type,
+# from linux/uinput.h. For EV_SYN it enables event types (UI_SET_EVBIT).
+UI_SET_BIT_NUMBERS = {
+    EV_SYN: 100,
+    EV_KEY: 101,
+    EV_REL: 102,
+    EV_ABS: 103,
+    EV_MSC: 104,
+    EV_LED: 105,
+    EV_SND: 106,
+    EV_FF: 107,
+    EV_SW: 109,
+}
+
+# struct input_absinfo: value, minimum, maximum, fuzz, flat, resolution
+ABS_INFO_FORMAT = str("6i")
+ABS_INFO_SIZE = struct.calcsize(ABS_INFO_FORMAT)
+
+AbsInfo = namedtuple(
+    "AbsInfo", ["value", "minimum", "maximum", "fuzz", "flat", "resolution"]
+)
+
+
+def _IOC(direction, request_type, number, size):
+    """Build an ioctl request number."""
+    # pylint: disable=invalid-name
+    return (
+        (direction << IOC_DIRSHIFT)
+        | (request_type << IOC_TYPESHIFT)
+        | (number << IOC_NRSHIFT)
+        | (size << IOC_SIZESHIFT)
+    )
+
+
+def _IOW(request_type, number, size):
+    """Build a request number for writing to the kernel."""
+    # pylint: disable=invalid-name
+    return _IOC(IOC_WRITE, request_type, number, size)
+
+
+def _IOR(request_type, number, size):
+    """Build a request number for reading from the kernel."""
+    # pylint: disable=invalid-name
+    return _IOC(IOC_READ, request_type, number, size)
+
+
+def EVIOCGKEY(length):
+    """Get the global key state."""
+    # pylint: disable=invalid-name
+    return _IOC(IOC_READ, ord("E"), 0x18, length)
+
+
+def EVIOCGLED(length):
+    """Get all the LEDs."""
+    # pylint: disable=invalid-name
+    return _IOC(IOC_READ, ord("E"), 0x19, length)
+
+
+def EVIOCGSW(length):
+    """Get all the switch states."""
+    # pylint: disable=invalid-name
+    return _IOC(IOC_READ, ord("E"), 0x1B, length)
+
+
+def EVIOCGBIT(ev_type, length):
+    """Get the event codes that the device supports for ev_type."""
+    # pylint: disable=invalid-name
+    return _IOC(IOC_READ, ord("E"), 0x20 + ev_type, length)
+
+
+def EVIOCGABS(axis):
+    """Get the value and limits of an absolute axis."""
+    # pylint: disable=invalid-name
+    return _IOR(ord("E"), 0x40 + axis, ABS_INFO_SIZE)
+
+
+def EVIOCSMASK():
+    """Set the event mask, which codes of a type are passed on."""
+    # pylint: disable=invalid-name
+    return _IOW(ord("E"), 0x93, INPUT_MASK_SIZE)
+
+
+def EVIOCGRAB():
+    """Grab or release the device, the argument being an int."""
+    # pylint: disable=invalid-name
+    return _IOW(ord("E"), 0x90, INT_SIZE)
+
+
+def UI_DEV_CREATE():
+    """Create the uinput device that has been set up."""
+    # pylint: disable=invalid-name
+    return _IOC(IOC_NONE, ord("U"), 1, 0)
+
+
+def UI_DEV_DESTROY():
+    """Remove the uinput device."""
+    # pylint: disable=invalid-name
+    return _IOC(IOC_NONE, ord("U"), 2, 0)
+
+
+def UI_SET_BIT(ev_type):
+    """Let the uinput device send a code of ev_type, or for EV_SYN,
+    an event type."""
+    # pylint: disable=invalid-name
+    return _IOW(ord("U"), UI_SET_BIT_NUMBERS[ev_type], INT_SIZE)
+
+
+def bitmap_size(max_code):
+    """The number of bytes in a bitmap holding codes up to max_code."""
+    return max_code // 8 + 1
+
+
+def get_bitmap(fd, request, max_code):
+    """Fill a bitmap of codes up to max_code using an ioctl request,
+    such as EVIOCGKEY."""
+    buf = bytearray(bitmap_size(max_code))
+    fcntl.ioctl(fd, request(len(buf)), buf, True)
+    return buf
+
+
+def get_bits(fd, ev_type, max_code):
+    """Get a bitmap of the codes the device supports for ev_type."""
+    buf = bytearray(bitmap_size(max_code))
+    fcntl.ioctl(fd, EVIOCGBIT(ev_type, len(buf)), buf, True)
+    return buf
+
+
+def iter_bits(bitmap):
+    """Yield the number of each bit that is set in the bitmap."""
+    for index, byte in enumerate(bitmap):
+        while byte:
+            low = byte & -byte
+            yield index * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+def get_abs_info(fd, axis):
+    """Get the struct input_absinfo of an absolute axis as an AbsInfo."""
+    buf = bytearray(ABS_INFO_SIZE)
+    fcntl.ioctl(fd, EVIOCGABS(axis), buf, True)
+    return AbsInfo._make(struct.unpack(ABS_INFO_FORMAT, buf))
+
+
+def grab(fd, grabbed=True):
+    """Grab the device, so only this file gets its events, or release it."""
+    fcntl.ioctl(fd, EVIOCGRAB(), 1 if grabbed else 0)
+
+
+def set_mask(fd, ev_type, bitmap):
+    """Only pass on the codes of ev_type that are set in the bitmap.
+    For ev_type 0 (EV_SYN), the bitmap is of the event types to pass
+    on, SYN events themselves are always passed on."""
+    buf = ctypes.create_string_buffer(bytes(bitmap), len(bitmap))
+    request = struct.pack(
+        INPUT_MASK_FORMAT, ev_type, len(bitmap), ctypes.addressof(buf)
+    )
+    fcntl.ioctl(fd, EVIOCSMASK(), request)
+
+
+def uinput_enable(fd, ev_type, code):
+    """Let the uinput device being set up send a code of ev_type, or
+    for EV_SYN, an event type."""
+    fcntl.ioctl(fd, UI_SET_BIT(ev_type), code)
+
+
+def uinput_create(fd):
+    """Create the uinput device once its codes and details are set."""
+    fcntl.ioctl(fd, UI_DEV_CREATE())
+
+
+def uinput_destroy(fd):
+    """Remove the uinput device."""
+    fcntl.ioctl(fd, UI_DEV_DESTROY())
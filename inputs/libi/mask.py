@@ -0,0 +1,67 @@
+"""Choosing which events a device passes on."""
+
+from .capabilities import EV_MAX, MAX_CODES
+from .ioctl import EV_SYN, bitmap_size
+
+
+def _full_bitmap(max_code):
+    """A bitmap with every code up to max_code set."""
+    return bytearray(b"\xff" * bitmap_size(max_code))
+
+
+class EventMask(object):  # pylint: disable=useless-object-inheritance
+    """The events to pass on, compiled both into the bitmaps that
+    EVIOCSMASK takes and into sets for filtering in userspace.
+
+    events maps each event type to the codes wanted, or to None for
+    every code of that type. If events is None, everything is passed
+    on. SYN events are always passed on, as the kernel does.
+    """
+
+    __slots__ = ("everything", "all_codes", "pairs")
+
+    def __init__(self, events=None):
+        self.everything = events is None
+        events = events or {}
+        self.all_codes = frozenset(
+            ev_type for ev_type, codes in events.items() if codes is None
+        )
+        self.pairs = frozenset(
+            (ev_type, code)
+            for ev_type, codes in events.items()
+            if codes is not None
+            for code in codes
+        )
+
+    def accepts(self, ev_type, code):
+        """Should this event be passed on?"""
+        return (
+            self.everything
+            or ev_type == EV_SYN
+            or ev_type in self.all_codes
+            or (ev_type, code) in self.pairs
+        )
+
+    def bitmaps(self):
+        """Yield (ev_type, bitmap) for each EVIOCSMASK call needed,
+        starting with the bitmap of event types (ev_type 0)."""
+        if self.everything:
+            yield EV_SYN, _full_bitmap(EV_MAX)
+            for ev_type, max_code in sorted(MAX_CODES.items()):
+                yield ev_type, _full_bitmap(max_code)
+            return
+
+        types = bytearray(bitmap_size(EV_MAX))
+        for ev_type in self.all_codes.union(ev_type for ev_type, _ in self.pairs):
+            types[ev_type >> 3] |= 1 << (ev_type & 7)
+        yield EV_SYN, types
+
+        for ev_type, max_code in sorted(MAX_CODES.items()):
+            if ev_type in self.all_codes:
+                yield ev_type, _full_bitmap(max_code)
+                continue
+            bitmap = bytearray(bitmap_size(max_code))
+            for pair_type, code in self.pairs:
+                if pair_type == ev_type and code <= max_code:
+                    bitmap[code >> 3] |= 1 << (code & 7)
+            yield ev_type, bitmap
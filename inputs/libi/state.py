@@ -0,0 +1,111 @@
+"""Keeping the current state of a device as its events are read."""
+
+from array import array
+
+from .ioctl import (
+    ABS_MAX,
+    EV_ABS,
+    EV_KEY,
+    EV_LED,
+    EV_SW,
+    KEY_MAX,
+    LED_MAX,
+    SW_MAX,
+    bitmap_size,
+    iter_bits,
+)
+
+
+def _bit_is_set(bitmap, code):
+    """Check one bit of a bitmap, codes past the end are never set."""
+    try:
+        return bool(bitmap[code >> 3] & (1 << (code & 7)))
+    except IndexError:
+        return False
+
+
+class DeviceState:
+    """The keys, LEDs and switches that are on, and the value of each
+    absolute axis, of a device.
+
+    The keys, LEDs and switches are bitmaps with the same layout as
+    the kernel's (i.e. EVIOCGKEY), and the axes are an array indexed
+    by axis code, so updating or asking about any of them is a single
+    index operation.
+
+    Codes can be given as numbers or, if the state was made with a
+    lookup function that turns a name into a number, as names such
+    as "KEY_A".
+
+    abs_info holds the AbsInfo (limits, fuzz, flat and resolution) of
+    each axis, when the kernel has been asked for it.
+    """
+
+    __slots__ = ("keys", "leds", "switches", "axes", "abs_info", "_lookup")
+
+    def __init__(self, lookup=None):
+        self.keys = bytearray(bitmap_size(KEY_MAX))
+        self.leds = bytearray(bitmap_size(LED_MAX))
+        self.switches = bytearray(bitmap_size(SW_MAX))
+        self.axes = array("i", bytes(4 * (ABS_MAX + 1)))
+        self.abs_info = {}
+        self._lookup = lookup
+
+    def _bitmap(self, ev_type):
+        """Get the bitmap for an event type, or None if there isn't one."""
+        if ev_type == EV_KEY:
+            return self.keys
+        if ev_type == EV_LED:
+            return self.leds
+        if ev_type == EV_SW:
+            return self.switches
+        return None
+
+    def _code(self, code):
+        """Turn a code name into its number."""
+        if isinstance(code, int):
+            return code
+        if self._lookup is None:
+            raise TypeError("Codes must be numbers without a lookup.")
+        return self._lookup(code)
+
+    def update(self, ev_type, code, value):
+        """Apply one evdev event to the state."""
+        if ev_type == EV_ABS:
+            if code <= ABS_MAX:
+                self.axes[code] = value
+            return
+        bitmap = self._bitmap(ev_type)
+        if bitmap is None or code >= len(bitmap) * 8:
+            return
+        if value:
+            bitmap[code >> 3] |= 1 << (code & 7)
+        else:
+            bitmap[code >> 3] &= ~(1 << (code & 7)) & 0xFF
+
+    def clear(self):
+        """Forget everything, as if the device had just been opened."""
+        for bitmap in (self.keys, self.leds, self.switches):
+            bitmap[:] = bytes(len(bitmap))
+        self.axes[:] = array("i", bytes(4 * len(self.axes)))
+        self.abs_info.clear()
+
+    def key_down(self, code):
+        """Is the key or button held down?"""
+        return _bit_is_set(self.keys, self._code(code))
+
+    def led_on(self, code):
+        """Is the LED on?"""
+        return _bit_is_set(self.leds, self._code(code))
+
+    def switch_on(self, code):
+        """Is the switch on?"""
+        return _bit_is_set(self.switches, self._code(code))
+
+    def axis(self, code):
+        """Get the last value of an absolute axis."""
+        return self.axes[self._code(code)]
+
+    def pressed(self):
+        """Get the codes of all the keys and buttons held down."""
+        return list(iter_bits(self.keys))
@@ -0,0 +1,35 @@
+"""Reading device details from sysfs, without reading them twice."""
+
+
+class SysfsCache(object):  # pylint: disable=useless-object-inheritance
+    """The text of each sysfs file that has been read, kept until it
+    is invalidated.
+
+    Only use it for details that can't change while a device is
+    plugged in, such as names and ids, not for live values such as
+    an LED's brightness.
+    """
+
+    def __init__(self):
+        self._files = {}
+
+    def read(self, path):
+        """Get the stripped text of a sysfs file, reading it only if
+        it isn't already known. Raises OSError if it can't be read."""
+        try:
+            return self._files[path]
+        except KeyError:
+            pass
+        with open(path) as sysfs_file:
+            text = sysfs_file.read().strip()
+        self._files[path] = text
+        return text
+
+    def invalidate(self, prefix=None):
+        """Forget the files whose paths start with prefix, or all of
+        them if no prefix is given."""
+        if prefix is None:
+            self._files.clear()
+            return
+        for path in [path for path in self._files if path.startswith(prefix)]:
+            del self._files[path]
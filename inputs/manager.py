@@ -3,24 +3,32 @@ This module provides a way to access all connected and detectible user input
 devices, such as keyboards, mice, gamepads, and other HID devices.
 """
 
+import errno
 import os
+import io
 import glob
+import selectors
 from warnings import warn
 import ctypes
 
+from . import constants
 from .constants import (
     XINPUT_DLL_NAMES,
     XINPUT_ERROR_DEVICE_NOT_CONNECTED,
     XINPUT_ERROR_SUCCESS,
     EVENT_MAP,
+    LAZY_EVENT_MAP,
 )
 
 from .libi.errors import UnknownEventType, UnknownEventCode
 
 from .libi.system import WIN, MAC, NIX
 from .libi.c import DWORD, HANDLE
+from .libi.capabilities import Capabilities
+from .libi.sysfs import SysfsCache
+from .hotplug import DEV_INPUT, HotplugMonitor
 from .devices.gamepad.gamepad import GamePad
-from .devices.base import OtherDevice
+from .devices.base import DeviceInfo, OtherDevice
 from .devices.gamepad._win import XinputState
 from .devices.mouse.mouse import Mouse, MightyMouse
 from .devices.keyboard.keyboard import Keyboard
@@ -42,15 +50,71 @@ class RawInputDeviceList(ctypes.Structure):
     _fields_ = [("hDevice", HANDLE), ("dwType", DWORD)]
 
 
+class EventCodes(dict):
+    """The code tables from constants.EVENT_MAP, each as a dict.
+
+    The tables that are only needed on one platform, such as wincodes,
+    are only made the first time they are asked for.
+    """
+
+    def __init__(self):
+        super(EventCodes, self).__init__(
+            (key, dict(value)) for key, value in EVENT_MAP
+        )
+
+    def __missing__(self, key):
+        try:
+            name = LAZY_EVENT_MAP[key]
+        except KeyError:
+            raise KeyError(key) from None
+        value = self[key] = dict(getattr(constants, name))
+        return value
+
+    def __contains__(self, key):
+        return super(EventCodes, self).__contains__(key) or key in LAZY_EVENT_MAP
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+# The event_names table for each platform, built by the first manager.
+_EVENT_NAMES = {}
+
+SYS_CLASS = "/sys/class"
+
+
 class DeviceManager(object):  # pylint: disable=useless-object-inheritance
     """Provides access to all connected and detectible user input
-    devices."""
+    devices.
+
+    read_size is passed on to each evdev device, it is the most events
+    that one read will drain from the device.
+
+    On Linux, the devices are looked for in dev_input and their details
+    in the sys_class directory of sysfs. Point these somewhere else to
+    use a stand-in device tree, such as in tests.
+    """
 
     # pylint: disable=too-many-instance-attributes
 
-    def __init__(self):
-        self.codes = {key: dict(value) for key, value in EVENT_MAP}
-        self._raw = []
+    def __init__(self, read_size=1, dev_input=DEV_INPUT, sys_class=SYS_CLASS):
+        self.read_size = read_size
+        self.dev_input = dev_input
+        self.sys_class = sys_class
+        self.codes = EventCodes()
+        self.event_names = self._get_event_names()
+        self._event_codes = None
+        # Indexes of the devices by character device path and name.
+        self._by_char_path = {}
+        self._by_char_name = {}
+        # Index of the devices by each DeviceInfo field and value, made
+        # by the first call to find.
+        self._info_index = None
+        self._checked_char_names = set()
+        self.sysfs = SysfsCache()
         self.keyboards = []
         self.mice = []
         self.gamepads = []
@@ -90,7 +154,10 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
         self.all_devices.extend(self.other_devices)
 
     def _parse_device_path(self, device_path, char_path_override=None):
-        """Parse each device and add to the approriate list."""
+        """Parse each device and add to the approriate list.
+
+        Return the new device, or None if it was skipped.
+        """
 
         # 1. Make sure that we can parse the device path.
         try:
@@ -101,25 +168,179 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
                 "not be parsed: %s" % device_path,
                 RuntimeWarning,
             )
-            return
+            return None
 
         # 2. Make sure each device is only added once.
-        realpath = os.path.realpath(device_path)
-        if realpath in self._raw:
-            return
-        self._raw.append(realpath)
-
-        # 3. All seems good, append the device to the relevant list.
+        char_path = char_path_override or os.path.realpath(device_path)
+        if char_path in self._by_char_path:
+            return None
+
+        # 3. Devices with an unknown suffix are classified by the
+        # events they can send.
+        capabilities = None
+        if NIX and device_type not in ("kbd", "mouse", "joystick"):
+            capabilities = self._get_capabilities(char_path)
+            if capabilities is not None:
+                device_type = capabilities.classify() or device_type
+
+        # 4. All seems good, append the device to the relevant list.
+        read_size = self.read_size
         if device_type == "kbd":
-            self.keyboards.append(Keyboard(self, device_path, char_path_override))
+            device_list, device_class = self.keyboards, Keyboard
         elif device_type == "mouse":
-            self.mice.append(Mouse(self, device_path, char_path_override))
+            device_list, device_class = self.mice, Mouse
         elif device_type == "joystick":
-            self.gamepads.append(GamePad(self, device_path, char_path_override))
+            device_list, device_class = self.gamepads, GamePad
         else:
-            self.other_devices.append(
-                OtherDevice(self, device_path, char_path_override)
+            device_list, device_class = self.other_devices, OtherDevice
+        device = device_class(
+            self, device_path, char_path_override, read_size=read_size
+        )
+        device._capabilities = capabilities  # pylint: disable=protected-access
+        device_list.append(device)
+        self._by_char_path[char_path] = device
+        self._by_char_name[os.path.basename(char_path)] = device
+        if self._info_index is not None:
+            self._index_info(device)
+        return device
+
+    def _add_device(self, device_path):
+        """Add a device that has just been plugged in.
+
+        Return the new device, or None if it was already known or
+        could not be set up (e.g. it went away again straight away).
+        """
+        try:
+            device = self._parse_device_path(device_path)
+        except OSError as err:
+            warn(
+                "The following device could not be added: %s (%s)"
+                % (device_path, err),
+                RuntimeWarning,
             )
+            return None
+        if device is not None:
+            self._update_all_devices()
+        return device
+
+    def _remove_device(self, device_path):
+        """Remove and close the device found at device_path, which has
+        just been unplugged.
+
+        Return the device, or None if no device was found there.
+        """
+        # pylint: disable=protected-access
+        for device in self.all_devices:
+            if device._device_path == device_path:
+                break
+        else:
+            return None
+        self._discard_device(device)
+        self._update_all_devices()
+        return device
+
+    def _discard_device(self, device):
+        """Take a device out of the lists and close it."""
+        # pylint: disable=protected-access
+        for device_list in (
+            self.keyboards,
+            self.mice,
+            self.gamepads,
+            self.other_devices,
+        ):
+            if device in device_list:
+                device_list.remove(device)
+        char_path = device._character_device_path
+        if self._by_char_path.get(char_path) is device:
+            del self._by_char_path[char_path]
+        char_name = os.path.basename(char_path)
+        if self._by_char_name.get(char_name) is device:
+            del self._by_char_name[char_name]
+        self._checked_char_names.discard(char_name)
+        self.sysfs.invalidate(self._sysfs_input_path(char_name))
+        if self._info_index is not None:
+            for field, value in zip(DeviceInfo._fields, device.info):
+                found = self._info_index[field].get(value, [])
+                if device in found:
+                    found.remove(device)
+        device.close()
+
+    def refresh(self):
+        """Bring the devices up to date with what is plugged in now.
+
+        Only the devices that have changed are touched: the ones that
+        are new are set up and the ones that have gone are closed and
+        removed, the rest (and their open files and state) are kept.
+        Devices are matched by their character device, e.g.
+        /dev/input/event3. Linux only.
+
+        Return the lists of added and removed devices.
+        """
+        # pylint: disable=protected-access
+        if not NIX:
+            return [], []
+        found = {}
+        for key in ("id", "path"):
+            for device_path in self._glob_device_paths(key):
+                found.setdefault(os.path.realpath(device_path), device_path)
+
+        removed = []
+        for device in list(self.all_devices):
+            char_path = device._character_device_path
+            if char_path not in found and not os.path.exists(char_path):
+                self._discard_device(device)
+                removed.append(device)
+
+        before = set(self.all_devices)
+        for realpath, device_path in found.items():
+            if realpath not in self._by_char_path:
+                self._parse_device_path(device_path)
+        self._update_all_devices()
+        present = {os.path.basename(path) for path in self._glob_event_dirs()}
+        for char_name in self._checked_char_names - present:
+            self.sysfs.invalidate(self._sysfs_input_path(char_name))
+        self._checked_char_names &= present
+        self._find_special()
+        self._update_all_devices()
+        added = [device for device in self.all_devices if device not in before]
+        return added, removed
+
+    def watch(self, on_add=None, on_remove=None):
+        """Keep the devices up to date as they are plugged in and
+        unplugged, in a background thread. Linux only.
+
+        on_add and on_remove are called (from that thread) with each
+        device that is added or removed. Return the HotplugMonitor,
+        call its stop method to stop watching.
+        """
+        monitor = HotplugMonitor(self, on_add, on_remove, self.dev_input)
+        monitor.start()
+        return monitor
+
+    @staticmethod
+    def _get_capabilities(char_path):
+        """Get the capabilities of a device, or None if we can't."""
+        try:
+            return Capabilities.from_path(char_path)
+        except OSError:
+            return None
+
+    def devices_with(self, ev_type, code=None):
+        """Get the devices that can send an event type, and code if
+        given, e.g. devices_with(0x03) for all devices with an
+        absolute axis.
+
+        Devices that can't be asked (i.e. not on Linux) are left out.
+        """
+        found = []
+        for device in self.all_devices:
+            try:
+                capabilities = device.capabilities
+            except OSError:
+                continue
+            if capabilities is not None and capabilities.has(ev_type, code):
+                found.append(device)
+        return found
 
     def _find_xinput(self):
         """Find most recent xinput library."""
@@ -243,13 +464,24 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
 
     def _find_by(self, key):
         """Find devices."""
-        by_path = glob.glob("/dev/input/by-{key}/*-event-*".format(key=key))
-        for device_path in by_path:
+        for device_path in self._glob_device_paths(key):
             self._parse_device_path(device_path)
 
+    def _glob_device_paths(self, key):
+        """Get the paths of the event devices in /dev/input/by-key."""
+        return glob.glob(os.path.join(self.dev_input, "by-" + key, "*-event-*"))
+
+    def _glob_event_dirs(self):
+        """Get the sysfs directories of the event devices."""
+        return glob.glob(os.path.join(self.sys_class, "input", "event*"))
+
+    def _sysfs_input_path(self, char_name):
+        """Get the sysfs directory of an event device, e.g. event3."""
+        return os.path.join(self.sys_class, "input", char_name, "")
+
     def _find_leds(self):
         """Find LED devices, Linux-only so far."""
-        for path in glob.glob("/sys/class/leds/*"):
+        for path in glob.glob(os.path.join(self.sys_class, "leds", "*")):
             self._parse_led_path(path)
 
     def _parse_led_path(self, path):
@@ -262,34 +494,209 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
             self.leds.append(LED(self, path, name))
 
     def _get_char_names(self):
-        """Get a list of already found devices."""
-        return [device.get_char_name() for device in self.all_devices]
+        """Get the char names of the already found devices."""
+        return self._by_char_name.keys()
+
+    def _index_info(self, device):
+        """Add a device to the index used by find."""
+        for field, value in zip(DeviceInfo._fields, device.info):
+            self._info_index[field].setdefault(value, []).append(device)
+
+    def find(self, **criteria):
+        """Find the devices whose DeviceInfo matches all the criteria,
+        e.g. find(vendor=0x045E, product=0x028E) for Xbox 360 pads, or
+        find(name="Barcode Scanner").
+
+        The details of every device are read the first time this is
+        called, and kept up to date as devices are added and removed.
+        """
+        unknown = set(criteria).difference(DeviceInfo._fields)
+        if unknown:
+            raise TypeError("Can't find devices by %s" % ", ".join(sorted(unknown)))
+        if self._info_index is None:
+            self._info_index = {field: {} for field in DeviceInfo._fields}
+            for device in self.all_devices:
+                self._index_info(device)
+        if not criteria:
+            return list(self.all_devices)
+        index = self._info_index
+        candidates = min(
+            (index[field].get(value, []) for field, value in criteria.items()),
+            key=len,
+        )
+        return [
+            device
+            for device in candidates
+            if all(
+                getattr(device.info, field) == value
+                for field, value in criteria.items()
+            )
+        ]
+
+    def by_char_name(self, char_name):
+        """Get the device with a char name such as event5, or None."""
+        return self._by_char_name.get(char_name)
+
+    def by_char_path(self, char_path):
+        """Get the device with a character device path such as
+        /dev/input/event5, or None."""
+        return self._by_char_path.get(char_path)
 
     def _find_special(self):
         """Look for special devices."""
         charnames = self._get_char_names()
-        for eventdir in glob.glob("/sys/class/input/event*"):
+        for eventdir in self._glob_event_dirs():
             char_name = os.path.split(eventdir)[1]
-            if char_name in charnames:
+            if char_name in charnames or char_name in self._checked_char_names:
                 continue
-            name_file = os.path.join(eventdir, "device", "name")
-            with open(name_file) as name_file:
-                device_name = name_file.read().strip()
-                if device_name in self.codes["specials"]:
-                    self._parse_device_path(
-                        self.codes["specials"][device_name],
-                        os.path.join("/dev/input", char_name),
-                    )
+            self._checked_char_names.add(char_name)
+            device_name = self.sysfs.read(os.path.join(eventdir, "device", "name"))
+            if device_name in self.codes["specials"]:
+                self._parse_device_path(
+                    self.codes["specials"][device_name],
+                    os.path.join(self.dev_input, char_name),
+                )
 
     def __iter__(self):
         return iter(self.all_devices)
 
+    def events(self, devices=None, timeout=None):
+        """Yield events from whichever device is ready.
+
+        Every device is watched by one selector (epoll on Linux), so a
+        single thread can service all of them without busy polling.
+        With a timeout (in seconds), stop once no device has produced
+        anything for that long. Unplugged devices are closed and
+        dropped.
+
+        This needs a POSIX system (Linux or Mac), on Windows select
+        only accepts sockets so every device is skipped with a warning.
+        """
+        if devices is None:
+            devices = self.all_devices
+        with selectors.DefaultSelector() as selector:
+            for device in devices:
+                self._register_device(selector, device)
+            while selector.get_map():
+                ready = selector.select(timeout)
+                if not ready:
+                    return
+                for key, _ in ready:
+                    try:
+                        # pylint: disable=protected-access
+                        events = key.data._do_iter()
+                    except OSError as err:
+                        if err.errno != errno.ENODEV:
+                            raise
+                        selector.unregister(key.fileobj)
+                        key.data.close()
+                        continue
+                    if events is not None:
+                        yield from events
+
+    async def aevents(self, devices=None):
+        """Asynchronously yield events from whichever device is ready.
+
+        This is the asyncio counterpart of events(). Each device has
+        one read waiting at a time, so a slow consumer leaves events
+        queued in the kernel. Devices that have gone away are closed
+        and dropped.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        if devices is None:
+            devices = self.all_devices
+        reads = {asyncio.ensure_future(device.aread()): device for device in devices}
+        try:
+            while reads:
+                done, _ = await asyncio.wait(
+                    reads, return_when=asyncio.FIRST_COMPLETED
+                )
+                for read in done:
+                    device = reads.pop(read)
+                    try:
+                        events = read.result()
+                    except EOFError:
+                        device.close()
+                        continue
+                    except OSError as err:
+                        if err.errno != errno.ENODEV:
+                            raise
+                        device.close()
+                        continue
+                    reads[asyncio.ensure_future(device.aread())] = device
+                    for event in events:
+                        yield event
+        finally:
+            for read in reads:
+                read.cancel()
+
+    @staticmethod
+    def _register_device(selector, device):
+        """Add a device to the selector, if it can be waited upon."""
+        try:
+            if WIN:
+                raise io.UnsupportedOperation("select only accepts sockets")
+            selector.register(device.fileno(), selectors.EVENT_READ, device)
+        except (io.UnsupportedOperation, OSError, ValueError):
+            warn(
+                "%s cannot be waited upon, so it was skipped." % device,
+                RuntimeWarning,
+            )
+
     def __getitem__(self, index):
         try:
             return self.all_devices[index]
         except IndexError:
             raise IndexError("list index out of range")
 
+    def _build_event_names(self):
+        """Precompile the lookup from a raw (type, code) pair to names.
+
+        This is done once, so decoding an event is a single dictionary
+        lookup rather than two nested ones (plus the wincodes remap on
+        Windows). The result is a snapshot of codes, later changes to
+        codes do not affect decoding unless this is called again.
+        """
+        event_names = {}
+        for raw_type, type_name in self.codes["types"].items():
+            for code, code_name in self.codes.get(type_name, {}).items():
+                event_names[raw_type, code] = (type_name, code_name)
+        if WIN:
+            key_names = self.codes["Key"]
+            for code, linux_code in self.codes["wincodes"].items():
+                if linux_code in key_names:
+                    event_names[0x01, code] = ("Key", key_names[linux_code])
+                else:
+                    event_names.pop((0x01, code), None)
+        return event_names
+
+    def _get_event_names(self):
+        """Get a copy of the event_names table for this platform, only
+        building it the first time."""
+        if WIN not in _EVENT_NAMES:
+            _EVENT_NAMES[WIN] = self._build_event_names()
+        return dict(_EVENT_NAMES[WIN])
+
+    def get_event_names(self, raw_type, code):
+        """Get the type name and code name of a raw evdev event."""
+        try:
+            return self.event_names[raw_type, code]
+        except KeyError:
+            event_type = self.get_event_type(raw_type)
+            raise UnknownEventCode("We don't know this event.", event_type, code)
+
+    def get_event_code(self, code_name):
+        """Get the raw code of a code name, such as KEY_A."""
+        if self._event_codes is None:
+            self._event_codes = {
+                name: code for (_, code), (_, name) in self.event_names.items()
+            }
+        try:
+            return self._event_codes[code_name]
+        except KeyError:
+            raise UnknownEventCode("We don't know this event.", None, code_name)
+
     def get_event_type(self, raw_type):
         """Convert the code to a useful string name."""
         try:
@@ -0,0 +1,146 @@
+"""Sending events to the handlers that want them."""
+
+import select
+
+from .utils import devices as shared_devices
+
+
+class EventRouter(object):  # pylint: disable=useless-object-inheritance
+    """Call handlers for the events they subscribed to.
+
+    Each subscription is for an event type, a code and a device, any
+    of which can be left as None to match everything. The handlers
+    for each (device, raw_type, raw_code) are worked out the first
+    time that combination is seen and then kept, so dispatching an
+    event is one dict lookup however many handlers there are.
+
+    Types and codes can be given as numbers or as names, e.g. "Key"
+    and "KEY_A", which are looked up in the manager's code tables.
+    """
+
+    def __init__(self, manager=None):
+        self.manager = shared_devices if manager is None else manager
+        self._routes = []
+        self._table = {}
+
+    def subscribe(self, handler, ev_type=None, code=None, device=None):
+        """Call handler(event) for each matching event. Return the
+        handler, so this can be used as a decorator via route()."""
+        if code is not None and ev_type is None:
+            raise ValueError("A code needs an event type.")
+        if ev_type is not None and not isinstance(ev_type, int):
+            ev_type = self.manager.get_typecode(ev_type)
+        if code is not None and not isinstance(code, int):
+            code = self.manager.get_event_code(code)
+        self._routes.append((handler, device, ev_type, code))
+        self._table.clear()
+        return handler
+
+    def route(self, ev_type=None, code=None, device=None):
+        """A decorator that subscribes the function it decorates."""
+
+        def _decorator(handler):
+            return self.subscribe(handler, ev_type, code, device)
+
+        return _decorator
+
+    def unsubscribe(self, handler):
+        """Stop calling handler, for all its subscriptions."""
+        self._routes = [route for route in self._routes if route[0] is not handler]
+        self._table.clear()
+
+    def handlers(self, device, raw_type, raw_code):
+        """Get the handlers for an event, as a tuple."""
+        key = (device, raw_type, raw_code)
+        try:
+            return self._table[key]
+        except KeyError:
+            pass
+        handlers = tuple(
+            handler
+            for handler, route_device, ev_type, code in self._routes
+            if (route_device is None or route_device is device)
+            and (ev_type is None or ev_type == raw_type)
+            and (code is None or code == raw_code)
+        )
+        self._table[key] = handlers
+        return handlers
+
+    def dispatch(self, events):
+        """Call the handlers of each of the events, which are
+        InputEvent objects. Return the number of handler calls."""
+        table = self._table
+        calls = 0
+        for event in events:
+            key = (event.device, event.raw_type, event.raw_code)
+            handlers = table.get(key)
+            if handlers is None:
+                handlers = self.handlers(*key)
+            for handler in handlers:
+                handler(event)
+            calls += len(handlers)
+        return calls
+
+    def events_for(self, device):
+        """Get the events the subscriptions want from device, in the
+        form device.subscribe() takes, or None if they want all of
+        them."""
+        events = {}
+        for _, route_device, ev_type, code in self._routes:
+            if route_device is not None and route_device is not device:
+                continue
+            if ev_type is None:
+                return None
+            if code is None:
+                events[ev_type] = None
+            elif ev_type not in events or events[ev_type] is not None:
+                events.setdefault(ev_type, []).append(code)
+        return events
+
+    def devices(self):
+        """Get the devices that can send an event some handler wants.
+
+        Devices named in a subscription are always included. For the
+        rest, the device's capabilities are checked where the kernel
+        can tell us them.
+        """
+        wanted = []
+        for device in self.manager.all_devices:
+            capabilities = device.capabilities
+            for _, route_device, ev_type, code in self._routes:
+                if route_device is not None:
+                    if route_device is device:
+                        break
+                elif (
+                    ev_type is None
+                    or capabilities is None
+                    or capabilities.has(ev_type, code)
+                ):
+                    break
+            else:
+                continue
+            wanted.append(device)
+        for _, route_device, _, _ in self._routes:
+            if route_device is not None and route_device not in wanted:
+                wanted.append(route_device)
+        return wanted
+
+    def poll(self, timeout=None, devices=None):
+        """Wait up to timeout seconds (None is forever) for any of the
+        devices (by default, those from devices()) to have events, and
+        dispatch them. Return the number of handler calls."""
+        if devices is None:
+            devices = self.devices()
+        if not devices:
+            return 0
+        ready = select.select(devices, [], [], timeout)[0]
+        calls = 0
+        for device in ready:
+            calls += self.dispatch(device.read(0))
+        return calls
+
+    def run(self):
+        """Dispatch events until interrupted."""
+        devices = self.devices()
+        while True:
+            self.poll(None, devices)
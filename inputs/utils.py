@@ -3,7 +3,39 @@
 from . import DeviceManager
 from .libi.errors import UnpluggedError
 
-devices = DeviceManager()  # pylint: disable=invalid-name
+
+class _LazyDeviceManager(object):  # pylint: disable=useless-object-inheritance
+    """Stands in for the shared DeviceManager, which is only made (and
+    so the devices are only looked for) the first time it is used,
+    rather than when inputs is imported."""
+
+    def __init__(self):
+        self._manager = None
+
+    def _get_manager(self):
+        """Make the DeviceManager if it has not been made yet."""
+        if self._manager is None:
+            self._manager = DeviceManager()
+        return self._manager
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self._get_manager(), name)
+
+    def __iter__(self):
+        return iter(self._get_manager())
+
+    def __getitem__(self, index):
+        return self._get_manager()[index]
+
+    def __repr__(self):
+        if self._manager is None:
+            return "<DeviceManager, devices not looked for yet>"
+        return repr(self._manager)
+
+
+devices = _LazyDeviceManager()  # pylint: disable=invalid-name
 
 
 def get_key():
@@ -0,0 +1,147 @@
+"""A stand-in /dev/input and sysfs, made of FIFOs and plain files.
+
+A DeviceManager pointed at a FakeInputTree finds its devices and reads
+their events through the same code as it would real ones, so it can be
+used by tests and benchmarks on any Linux machine, without root.
+"""
+
+import itertools
+import os
+import shutil
+import struct
+import tempfile
+
+from inputs.libi.c import EVENT_FORMAT
+from inputs.libi.ioctl import EV_SYN, SYN_REPORT
+from inputs.manager import DeviceManager
+
+EVENT_STRUCT = struct.Struct(EVENT_FORMAT)
+
+
+def pack_events(events, syn=True, tv_sec=0, tv_usec=0):
+    """Pack (ev_type, code, value) tuples as evdev would, with a
+    SYN_REPORT at the end unless syn is False."""
+    pack = EVENT_STRUCT.pack
+    data = bytearray()
+    for ev_type, code, value in events:
+        data += pack(tv_sec, tv_usec, ev_type, code, value)
+    if syn:
+        data += pack(tv_sec, tv_usec, EV_SYN, SYN_REPORT, 0)
+    return bytes(data)
+
+
+class FakeEvdev(object):  # pylint: disable=useless-object-inheritance
+    """A fake event device, a FIFO in place of the character device."""
+
+    def __init__(self, path, link):
+        self.path = path
+        self.link = link
+        # Open for writing and reading, so that opening does not wait
+        # for a reader, and readers never see the end of the file.
+        self.fd = os.open(path, os.O_RDWR)
+
+    def write(self, data):
+        """Write raw event data for the device to send."""
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view) :]
+
+    def write_events(self, events, syn=True):
+        """Write (ev_type, code, value) tuples for the device to send."""
+        self.write(pack_events(events, syn))
+
+    def close(self):
+        """Close our end of the FIFO."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class FakeInputTree(object):  # pylint: disable=useless-object-inheritance
+    """A temporary directory holding a dev/input and a sys/class tree
+    laid out like the real ones, with a FIFO for each device."""
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix="inputs-")
+        self.dev_input = os.path.join(self.root, "dev", "input")
+        self.sys_class = os.path.join(self.root, "sys", "class")
+        for path in (
+            os.path.join(self.dev_input, "by-id"),
+            os.path.join(self.dev_input, "by-path"),
+            os.path.join(self.sys_class, "input"),
+            os.path.join(self.sys_class, "leds"),
+        ):
+            os.makedirs(path)
+        self.devices = []
+        self._numbers = itertools.count()
+
+    # pylint: disable=too-many-arguments
+    def add_device(
+        self,
+        name,
+        device_type="kbd",
+        bustype=0x03,
+        vendor=0,
+        product=0,
+        version=1,
+        phys="",
+        uniq="",
+        link_dir="by-id",
+    ):
+        """Add a device with a symlink such as by-id/usb-Name-event-kbd,
+        and its sysfs details. Return the FakeEvdev."""
+        char_name = "event%d" % next(self._numbers)
+        path = os.path.join(self.dev_input, char_name)
+        os.mkfifo(path)
+        link = os.path.join(
+            self.dev_input,
+            link_dir,
+            "usb-%s-event-%s" % (name.replace(" ", "_"), device_type),
+        )
+        os.symlink(os.path.join("..", char_name), link)
+        device_dir = os.path.join(self.sys_class, "input", char_name, "device")
+        os.makedirs(os.path.join(device_dir, "id"))
+        files = {
+            "name": name,
+            "phys": phys,
+            "uniq": uniq,
+            "id/bustype": "%04x" % bustype,
+            "id/vendor": "%04x" % vendor,
+            "id/product": "%04x" % product,
+            "id/version": "%04x" % version,
+        }
+        for filename, text in files.items():
+            with open(os.path.join(device_dir, filename), "w") as sysfs_file:
+                sysfs_file.write(text + "\n")
+        device = FakeEvdev(path, link)
+        self.devices.append(device)
+        return device
+
+    def remove_device(self, device):
+        """Take a device out of the tree, as if it was unplugged."""
+        os.remove(device.link)
+        os.remove(device.path)
+        shutil.rmtree(
+            os.path.join(self.sys_class, "input", os.path.basename(device.path))
+        )
+        device.close()
+        self.devices.remove(device)
+
+    def manager(self, **kwargs):
+        """Make a DeviceManager that looks for devices in this tree."""
+        return DeviceManager(
+            dev_input=self.dev_input, sys_class=self.sys_class, **kwargs
+        )
+
+    def close(self):
+        """Close the devices and delete the tree."""
+        for device in self.devices:
+            device.close()
+        self.devices = []
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
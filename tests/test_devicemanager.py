@@ -2,14 +2,22 @@
 
 # pylint: disable=protected-access,no-self-use
 from unittest import TestCase
+import asyncio
+import errno
+import io
+import os
+import struct
 
 import inputs
 
 from unittest import mock
 from pathlib import PurePath
 
-from inputs.libi.errors import UnknownEventType
-from inputs.manager import DeviceManager
+from inputs.devices.base import DeviceInfo, InputDevice
+from inputs.libi.c import EVENT_FORMAT
+from inputs.libi.capabilities import Capabilities
+from inputs.libi.errors import UnknownEventCode, UnknownEventType
+from inputs.manager import DeviceManager, EventCodes
 
 
 RAW = ""
@@ -158,11 +166,13 @@ class DeviceManagerTestCase(TestCase):
         """Parses the path and adds a keyboard object."""
         mock_realpath.side_effect = lambda path: path
         self.device_manger._parse_device_path(KEYBOARD_PATH)
-        mock_keyboard.assert_called_with(mock.ANY, KEYBOARD_PATH, None)
+        mock_keyboard.assert_called_with(mock.ANY, KEYBOARD_PATH, None, read_size=1)
         mock_realpath.assert_called_with(KEYBOARD_PATH)
         self.assertEqual(len(self.device_manger.keyboards), 1)
-        self.assertEqual(len(self.device_manger._raw), 1)
-        self.assertEqual(self.device_manger._raw[0], KEYBOARD_PATH)
+        self.assertEqual(list(self.device_manger._by_char_path), [KEYBOARD_PATH])
+        self.assertIs(
+            self.device_manger.by_char_path(KEYBOARD_PATH), mock_keyboard.return_value
+        )
 
     @mock.patch("os.path.realpath")
     @mock.patch("inputs.manager.Keyboard")
@@ -171,7 +181,7 @@ class DeviceManagerTestCase(TestCase):
         self.assertEqual(len(self.device_manger.keyboards), 0)
         mock_realpath.side_effect = lambda path: path
         self.device_manger._parse_device_path(KEYBOARD_PATH)
-        mock_keyboard.assert_called_with(mock.ANY, KEYBOARD_PATH, None)
+        mock_keyboard.assert_called_with(mock.ANY, KEYBOARD_PATH, None, read_size=1)
         mock_realpath.assert_called_with(KEYBOARD_PATH)
         self.assertEqual(len(self.device_manger.keyboards), 1)
         self.device_manger._parse_device_path(KEYBOARD_PATH)
@@ -183,11 +193,13 @@ class DeviceManagerTestCase(TestCase):
         """Parses the path and adds a mouse object."""
         mock_realpath.side_effect = lambda path: path
         self.device_manger._parse_device_path(MOUSE_PATH)
-        mock_mouse.assert_called_with(mock.ANY, MOUSE_PATH, None)
+        mock_mouse.assert_called_with(mock.ANY, MOUSE_PATH, None, read_size=1)
         mock_realpath.assert_called_with(MOUSE_PATH)
         self.assertEqual(len(self.device_manger.mice), 1)
-        self.assertEqual(len(self.device_manger._raw), 1)
-        self.assertEqual(self.device_manger._raw[0], MOUSE_PATH)
+        self.assertEqual(list(self.device_manger._by_char_path), [MOUSE_PATH])
+        self.assertIs(
+            self.device_manger.by_char_path(MOUSE_PATH), mock_mouse.return_value
+        )
 
     @mock.patch("os.path.realpath")
     @mock.patch("inputs.manager.GamePad")
@@ -195,11 +207,167 @@ class DeviceManagerTestCase(TestCase):
         """Parses the path and adds a gamepad object."""
         mock_realpath.side_effect = lambda path: path
         self.device_manger._parse_device_path(GAMEPAD_PATH)
-        mock_gamepad.assert_called_with(mock.ANY, GAMEPAD_PATH, None)
+        mock_gamepad.assert_called_with(mock.ANY, GAMEPAD_PATH, None, read_size=1)
         mock_realpath.assert_called_with(GAMEPAD_PATH)
         self.assertEqual(len(self.device_manger.gamepads), 1)
-        self.assertEqual(len(self.device_manger._raw), 1)
-        self.assertEqual(self.device_manger._raw[0], GAMEPAD_PATH)
+        self.assertEqual(list(self.device_manger._by_char_path), [GAMEPAD_PATH])
+        self.assertIs(
+            self.device_manger.by_char_path(GAMEPAD_PATH), mock_gamepad.return_value
+        )
+
+    @mock.patch("inputs.manager.NIX", True)
+    @mock.patch("os.path.realpath")
+    @mock.patch("inputs.manager.GamePad")
+    def test_parse_device_path_by_capabilities(self, mock_gamepad, mock_realpath):
+        """Devices with an unknown suffix are classified by capability."""
+        mock_realpath.side_effect = lambda path: path
+        capabilities = Capabilities(
+            bytearray(b"\x0a\x00\x00\x00"),
+            {1: bytearray(0x2FF // 8 + 1), 3: bytearray(b"\x01" + bytes(7))},
+        )
+        capabilities.codes[1][0x130 >> 3] = 1  # BTN_GAMEPAD
+        with mock.patch.object(
+            inputs.manager.Capabilities, "from_path", return_value=capabilities
+        ) as mock_from_path:
+            self.device_manger._parse_device_path(OTHER_PATH)
+        mock_from_path.assert_called_with(OTHER_PATH)
+        mock_gamepad.assert_called_with(mock.ANY, OTHER_PATH, None, read_size=1)
+        self.assertEqual(len(self.device_manger.gamepads), 1)
+        self.assertIs(self.device_manger.gamepads[0]._capabilities, capabilities)
+
+    @mock.patch("os.path.realpath")
+    @mock.patch("inputs.manager.GamePad")
+    def test_add_and_remove_device(self, mock_gamepad, mock_realpath):
+        """Devices can be added and removed one at a time."""
+        mock_realpath.side_effect = lambda path: path
+        gamepad = mock_gamepad.return_value
+        gamepad._device_path = GAMEPAD_PATH
+        gamepad._character_device_path = GAMEPAD_PATH
+        self.device_manger.sysfs = mock.MagicMock()
+        self.assertIs(self.device_manger._add_device(GAMEPAD_PATH), gamepad)
+        self.assertIsNone(self.device_manger._add_device(GAMEPAD_PATH))
+        self.assertEqual(self.device_manger.all_devices, [gamepad])
+
+        self.assertIsNone(self.device_manger._remove_device(KEYBOARD_PATH))
+        self.assertIs(self.device_manger._remove_device(GAMEPAD_PATH), gamepad)
+        gamepad.close.assert_called_once_with()
+        self.assertEqual(self.device_manger.gamepads, [])
+        self.device_manger.sysfs.invalidate.assert_called_once_with(
+            "/sys/class/input/%s/" % os.path.basename(GAMEPAD_PATH)
+        )
+        self.assertEqual(self.device_manger.all_devices, [])
+        self.assertEqual(self.device_manger._by_char_path, {})
+        self.assertEqual(self.device_manger._by_char_name, {})
+
+    @mock.patch("os.path.realpath")
+    @mock.patch("inputs.manager.GamePad")
+    def test_add_device_gone(self, mock_gamepad, mock_realpath):
+        """A device that can't be set up is skipped with a warning."""
+        mock_realpath.side_effect = lambda path: path
+        mock_gamepad.side_effect = FileNotFoundError
+        with self.assertWarns(RuntimeWarning):
+            self.assertIsNone(self.device_manger._add_device(GAMEPAD_PATH))
+        self.assertEqual(self.device_manger._by_char_path, {})
+
+    @mock.patch("inputs.manager.NIX", True)
+    @mock.patch("os.path.exists", return_value=False)
+    @mock.patch("os.path.realpath")
+    @mock.patch("glob.glob")
+    @mock.patch("inputs.manager.GamePad")
+    def test_refresh(self, mock_gamepad, mock_glob, mock_realpath, mock_exists):
+        """refresh only sets up new devices and removes the ones that went."""
+        links = {
+            "/dev/input/by-id/usb-kbd-event-kbd": "/dev/input/event1",
+            "/dev/input/by-id/usb-pad-event-joystick": "/dev/input/event3",
+            "/dev/input/by-path/pci-pad-event-joystick": "/dev/input/event3",
+        }
+        mock_realpath.side_effect = links.get
+        mock_glob.side_effect = lambda pattern: {
+            "/dev/input/by-id/*-event-*": sorted(links)[:2],
+            "/dev/input/by-path/*-event-*": sorted(links)[2:],
+        }.get(pattern, [])
+        kept = mock.MagicMock(_character_device_path="/dev/input/event1")
+        gone = mock.MagicMock(_character_device_path="/dev/input/event2")
+        gone.get_char_name.return_value = "event2"
+        self.device_manger.keyboards = [kept]
+        self.device_manger.mice = [gone]
+        self.device_manger._by_char_path = {
+            "/dev/input/event1": kept,
+            "/dev/input/event2": gone,
+        }
+        self.device_manger._by_char_name = {"event1": kept, "event2": gone}
+        self.device_manger._update_all_devices()
+
+        added, removed = self.device_manger.refresh()
+
+        mock_gamepad.assert_called_once_with(
+            mock.ANY, "/dev/input/by-id/usb-pad-event-joystick", None, read_size=1
+        )
+        self.assertEqual(added, [mock_gamepad.return_value])
+        self.assertEqual(removed, [gone])
+        gone.close.assert_called_once_with()
+        kept.close.assert_not_called()
+        self.assertEqual(
+            self.device_manger.all_devices, [kept, mock_gamepad.return_value]
+        )
+        self.assertEqual(
+            list(self.device_manger._by_char_path),
+            ["/dev/input/event1", "/dev/input/event3"],
+        )
+        self.assertIs(
+            self.device_manger.by_char_name("event3"), mock_gamepad.return_value
+        )
+        self.assertIsNone(self.device_manger.by_char_name("event2"))
+
+    def test_find(self):
+        """find looks devices up by their details, and keeps up."""
+        pad_one = mock.MagicMock(_character_device_path="/dev/input/event1")
+        pad_one.info = DeviceInfo("Pad", 3, 0x045E, 0x028E, 0x110, "usb-1", None)
+        pad_two = mock.MagicMock(_character_device_path="/dev/input/event2")
+        pad_two.info = DeviceInfo("Pad", 3, 0x045E, 0x028E, 0x110, "usb-2", None)
+        scanner = mock.MagicMock(_character_device_path="/dev/input/event3")
+        scanner.info = DeviceInfo("Scanner", 3, 0x05E0, 0x1200, 1, "usb-3", "S1")
+        self.device_manger.gamepads = [pad_one, pad_two]
+        self.device_manger.other_devices = [scanner]
+        self.device_manger._update_all_devices()
+
+        self.assertEqual(
+            self.device_manger.find(vendor=0x045E, product=0x028E), [pad_one, pad_two]
+        )
+        self.assertEqual(self.device_manger.find(name="Pad", phys="usb-2"), [pad_two])
+        self.assertEqual(self.device_manger.find(uniq="S1"), [scanner])
+        self.assertEqual(self.device_manger.find(vendor=0x1234), [])
+        with self.assertRaises(TypeError):
+            self.device_manger.find(colour="red")
+
+        self.device_manger._discard_device(pad_one)
+        self.assertEqual(self.device_manger.find(product=0x028E), [pad_two])
+
+    @mock.patch("os.path.realpath")
+    @mock.patch("inputs.manager.GamePad")
+    def test_find_added(self, mock_gamepad, mock_realpath):
+        """Devices added after find was first called are found."""
+        mock_realpath.side_effect = lambda path: path
+        self.assertEqual(self.device_manger.find(vendor=0x045E), [])
+        mock_gamepad.return_value.info = DeviceInfo(
+            "Pad", 3, 0x045E, 0x028E, 0x110, None, None
+        )
+        self.device_manger._add_device(GAMEPAD_PATH)
+        self.assertEqual(
+            self.device_manger.find(vendor=0x045E), [mock_gamepad.return_value]
+        )
+
+    def test_devices_with(self):
+        """devices_with filters the devices by capability."""
+        stick = mock.MagicMock()
+        stick.capabilities.has.side_effect = lambda ev_type, code: ev_type == 3
+        keyboard = mock.MagicMock()
+        keyboard.capabilities.has.return_value = False
+        unknown = mock.MagicMock()
+        unknown.capabilities = None
+        self.device_manger.all_devices = [keyboard, stick, unknown]
+        self.assertEqual(self.device_manger.devices_with(3), [stick])
+        self.assertEqual(self.device_manger.devices_with(1, 30), [])
 
     @mock.patch("os.path.realpath")
     @mock.patch("inputs.manager.OtherDevice")
@@ -207,18 +375,29 @@ class DeviceManagerTestCase(TestCase):
         """Parses the path and adds an other object."""
         mock_realpath.side_effect = lambda path: path
         self.device_manger._parse_device_path(OTHER_PATH)
-        mock_other.assert_called_with(mock.ANY, OTHER_PATH, None)
+        mock_other.assert_called_with(mock.ANY, OTHER_PATH, None, read_size=1)
         mock_realpath.assert_called_with(OTHER_PATH)
         self.assertEqual(len(self.device_manger.other_devices), 1)
-        self.assertEqual(len(self.device_manger._raw), 1)
-        self.assertEqual(self.device_manger._raw[0], OTHER_PATH)
+        self.assertEqual(list(self.device_manger._by_char_path), [OTHER_PATH])
+        self.assertIs(
+            self.device_manger.by_char_path(OTHER_PATH), mock_other.return_value
+        )
+
+    @mock.patch("os.path.realpath")
+    @mock.patch("inputs.manager.Mouse")
+    def test_parse_device_path_read_size(self, mock_mouse, mock_realpath):
+        """The manager's read_size is passed on to each device."""
+        mock_realpath.side_effect = lambda path: path
+        self.device_manger.read_size = 64
+        self.device_manger._parse_device_path(MOUSE_PATH)
+        mock_mouse.assert_called_with(mock.ANY, MOUSE_PATH, None, read_size=64)
 
     def test_parse_invalid_path(self):
         """Raise warning for invalid path."""
         with self.assertWarns(RuntimeWarning):
             self.device_manger._parse_device_path("Bob")
 
-        self.assertEqual(self.device_manger._raw, [])
+        self.assertEqual(self.device_manger._by_char_path, {})
         self.assertEqual(self.device_manger.keyboards, [])
         self.assertEqual(self.device_manger.mice, [])
         self.assertEqual(self.device_manger.gamepads, [])
@@ -262,6 +441,88 @@ class DeviceManagerTestCase(TestCase):
         with self.assertRaises(inputs.UnknownEventCode):
             self.device_manger.get_event_string("Key", 0x999)
 
+    def test_get_event_names(self):
+        """get_event_names gives both names from one lookup."""
+        get_event_names = self.device_manger.get_event_names
+        self.assertEqual(get_event_names(0x01, 30), ("Key", "KEY_A"))
+        self.assertEqual(get_event_names(0x01, 0x133), ("Key", "BTN_NORTH"))
+        self.assertEqual(get_event_names(0x03, 0x10), ("Absolute", "ABS_HAT0X"))
+        self.assertEqual(get_event_names(0x04, 0x04), ("Misc", "MSC_SCAN"))
+        self.assertEqual(get_event_names(0x00, 0x00), ("Sync", "SYN_REPORT"))
+
+    def test_get_event_names_matches_codes(self):
+        """get_event_names agrees with the nested codes lookups."""
+        for raw_type, type_name in self.device_manger.codes["types"].items():
+            for code, code_name in self.device_manger.codes.get(type_name, {}).items():
+                self.assertEqual(
+                    self.device_manger.get_event_names(raw_type, code),
+                    (type_name, code_name),
+                )
+
+    def test_get_event_names_unknown_code(self):
+        """get_event_names raises an exception for an unknown event code."""
+        with self.assertRaises(UnknownEventCode):
+            self.device_manger.get_event_names(0x01, 0x2FE)
+
+    def test_codes_lazy_platform_tables(self):
+        """wincodes is only made from the Windows table when asked for."""
+        codes = EventCodes()
+        self.assertNotIn("wincodes", dict(codes))
+        self.assertIn("wincodes", codes)
+        self.assertEqual(codes["wincodes"][0x01], 0x110)
+        self.assertEqual(codes.get("wincodes")[0x02], 0x111)
+        self.assertIsNone(codes.get("not a table"))
+        with self.assertRaises(KeyError):
+            codes["not a table"]  # pylint: disable=pointless-statement
+        self.assertEqual(codes["type_codes"]["Key"], 0x01)
+        self.assertEqual(EventCodes()["type_codes"]["Key"], 0x01)
+
+    def test_event_names_copied(self):
+        """Each manager gets its own copy of the prebuilt event names."""
+        with mock.patch.object(DeviceManager, "_post_init"):
+            other = DeviceManager()
+        self.assertEqual(other.event_names, self.device_manger.event_names)
+        other.event_names[0x01, 30] = ("Key", "KEY_Q")
+        self.assertEqual(
+            self.device_manger.get_event_names(0x01, 30), ("Key", "KEY_A")
+        )
+
+    def test_platform_constants(self):
+        """The platform tables are loaded from their own modules."""
+        # pylint: disable=import-outside-toplevel
+        from inputs import constants, _constants_mac
+
+        self.assertIs(constants.MAC_KEYS, _constants_mac.MAC_KEYS)
+        with self.assertRaises(AttributeError):
+            constants.NOT_A_TABLE  # pylint: disable=pointless-statement
+
+    def test_get_event_code(self):
+        """get_event_code turns a code name back into its number."""
+        self.assertEqual(self.device_manger.get_event_code("KEY_A"), 30)
+        self.assertEqual(self.device_manger.get_event_code("ABS_Y"), 1)
+        with self.assertRaises(UnknownEventCode):
+            self.device_manger.get_event_code("KEY_NOT_A_KEY")
+
+    def test_get_event_names_unknown_type(self):
+        """get_event_names raises an exception for an unknown event type."""
+        with self.assertRaises(UnknownEventType):
+            self.device_manger.get_event_names(0x64, 0)
+
+    def test_build_event_names_on_win(self):
+        """On Windows, key codes are remapped through wincodes."""
+        inputs.manager.WIN = True
+        try:
+            event_names = self.device_manger._build_event_names()
+        finally:
+            inputs.manager.WIN = False
+        # Windows' left mouse button is evdev's BTN_LEFT
+        self.assertEqual(event_names[0x01, 0x01], ("Key", "BTN_LEFT"))
+        self.assertEqual(event_names[0x01, 0x08], ("Key", "KEY_BACKSPACE"))
+        # Codes with no evdev equivalent are reserved
+        self.assertEqual(event_names[0x01, 0x03], ("Key", "KEY_RESERVED"))
+        # Other types are untouched
+        self.assertEqual(event_names[0x02, 0x08], ("Relative", "REL_WHEEL"))
+
     @mock.patch.object(DeviceManager, "_find_special")
     @mock.patch.object(DeviceManager, "_find_by")
     def test_find_devices(self, mock_find_by, mock_find_special):
@@ -290,7 +551,7 @@ class DeviceManagerTestCase(TestCase):
             self.assertEqual(self.device_manger[device], device)
 
     @mock.patch.object(DeviceManager, "_parse_device_path")
-    @mock.patch("inputs.manager.open", mock.mock_open(read_data=MOCK_DEVICE))
+    @mock.patch("inputs.libi.sysfs.open", mock.mock_open(read_data=MOCK_DEVICE))
     @mock.patch("glob.glob")
     def test_find_special(self, mock_glob, mock_parse_device_path):
         """Find a special device."""
@@ -320,7 +581,7 @@ class DeviceManagerTestCase(TestCase):
 
     @mock.patch.object(DeviceManager, "_parse_device_path")
     @mock.patch.object(DeviceManager, "_get_char_names")
-    @mock.patch("inputs.manager.open", mock.mock_open(read_data=MOCK_DEVICE))
+    @mock.patch("inputs.libi.sysfs.open", mock.mock_open(read_data=MOCK_DEVICE))
     @mock.patch("glob.glob")
     def test_find_special_repeated(
         self, mock_glob, mock_get_char_names, mock_parse_device_path
@@ -448,3 +709,107 @@ class DeviceManagerPlatformTestCase(TestCase):
             "unknown": 0,
         }
         self.device_manager._count_devices()
+
+
+class DeviceManagerEventsTestCase(TestCase):
+    """Test reading events from many devices at once."""
+
+    # pylint: disable=arguments-differ
+
+    @mock.patch.object(DeviceManager, "_post_init")
+    def setUp(self, mock_method):
+        self.device_manager = DeviceManager()
+        self.pipes = []
+
+    def tearDown(self):
+        for read_file, write_fd in self.pipes:
+            read_file.close()
+            os.close(write_fd)
+
+    def _make_device(self, path):
+        """Make a device that reads from a pipe."""
+        read_fd, write_fd = os.pipe()
+        read_file = io.open(read_fd, "rb", buffering=0)
+        self.pipes.append((read_file, write_fd))
+        with mock.patch.object(InputDevice, "_set_name"):
+            device = InputDevice(self.device_manager, path, char_path_override=path)
+        device._character_file = read_file
+        return device, write_fd
+
+    def test_events(self):
+        """It yields the events from each device that is ready."""
+        keyboard, keyboard_fd = self._make_device(KEYBOARD_PATH)
+        mouse, mouse_fd = self._make_device(MOUSE_PATH)
+        self.device_manager.all_devices = [keyboard, mouse]
+        os.write(keyboard_fd, struct.pack(EVENT_FORMAT, 1, 0, 1, 30, 1))
+        os.write(mouse_fd, struct.pack(EVENT_FORMAT, 2, 0, 2, 0, 5))
+        events = list(self.device_manager.events(timeout=0))
+        self.assertEqual(len(events), 2)
+        self.assertEqual({event.device for event in events}, {keyboard, mouse})
+        codes = sorted(event.code for event in events)
+        self.assertEqual(codes, ["KEY_A", "REL_X"])
+
+    def test_events_timeout(self):
+        """It stops when no device is ready before the timeout."""
+        keyboard, _ = self._make_device(KEYBOARD_PATH)
+        self.assertEqual(list(self.device_manager.events([keyboard], 0)), [])
+
+    def test_events_unsupported_device(self):
+        """Devices without a file descriptor are skipped."""
+        device = mock.MagicMock()
+        device.fileno.side_effect = io.UnsupportedOperation
+        with self.assertWarns(RuntimeWarning):
+            self.assertEqual(list(self.device_manager.events([device], 0)), [])
+
+    def test_aevents(self):
+        """It yields events from each device to an asyncio consumer."""
+        keyboard, keyboard_fd = self._make_device(KEYBOARD_PATH)
+        mouse, mouse_fd = self._make_device(MOUSE_PATH)
+        self.device_manager.all_devices = [keyboard, mouse]
+
+        async def consume():
+            events = []
+            async for event in self.device_manager.aevents():
+                events.append(event)
+                if len(events) == 2:
+                    break
+            return events
+
+        os.write(keyboard_fd, struct.pack(EVENT_FORMAT, 1, 0, 1, 30, 1))
+        os.write(mouse_fd, struct.pack(EVENT_FORMAT, 2, 0, 2, 0, 5))
+        events = asyncio.run(consume())
+        self.assertEqual({event.device for event in events}, {keyboard, mouse})
+
+    def test_events_unplugged(self):
+        """A device that has gone away is closed and dropped."""
+        keyboard, _ = self._make_device(KEYBOARD_PATH)
+        keyboard.close = mock.MagicMock()
+        with mock.patch.object(
+            InputDevice, "_do_iter", side_effect=OSError(errno.ENODEV, "Gone")
+        ):
+            os.write(self.pipes[0][1], b"x")
+            self.assertEqual(list(self.device_manager.events([keyboard])), [])
+        keyboard.close.assert_called_once()
+
+    def test_events_on_win(self):
+        """On Windows, devices cannot be selected upon so are skipped."""
+        keyboard, _ = self._make_device(KEYBOARD_PATH)
+        inputs.manager.WIN = True
+        try:
+            with self.assertWarns(RuntimeWarning):
+                self.assertEqual(list(self.device_manager.events([keyboard])), [])
+        finally:
+            inputs.manager.WIN = False
+
+    def test_aevents_device_gone(self):
+        """A device whose listener has gone away is closed and dropped."""
+        keyboard, keyboard_fd = self._make_device(KEYBOARD_PATH)
+        keyboard.close = mock.MagicMock()
+
+        async def consume():
+            return [event async for event in self.device_manager.aevents([keyboard])]
+
+        os.write(keyboard_fd, b"x")
+        with mock.patch.object(InputDevice, "_do_iter", side_effect=EOFError):
+            self.assertEqual(asyncio.run(asyncio.wait_for(consume(), 5)), [])
+        keyboard.close.assert_called_once()
@@ -0,0 +1,74 @@
+"""Tests that run DeviceManager and InputDevice against a fake device tree."""
+
+# pylint: disable=protected-access,no-self-use
+from unittest import TestCase, skipUnless
+
+from inputs.libi.system import NIX
+
+from tests.fakedev import FakeInputTree
+
+
+@skipUnless(NIX, "The fake device tree is laid out like Linux's")
+class FakeInputTreeTestCase(TestCase):
+    """Test the devices in a FakeInputTree."""
+
+    def setUp(self):
+        self.tree = FakeInputTree()
+        self.keyboard = self.tree.add_device(
+            "Fake Keyboard", vendor=0x046D, product=0xC31C
+        )
+        self.tree.add_device("Fake Mouse", "mouse", link_dir="by-path")
+        self.tree.add_device("Fake Pad", "joystick", uniq="pad-1")
+
+    def tearDown(self):
+        self.tree.close()
+
+    def test_found(self):
+        """The devices are found, with their details from sysfs."""
+        manager = self.tree.manager()
+        self.assertEqual(
+            [str(device) for device in manager.all_devices],
+            ["Fake Keyboard", "Fake Mouse", "Fake Pad"],
+        )
+        keyboard = manager.keyboards[0]
+        self.assertEqual(keyboard.protocol, "usb")
+        self.assertEqual(keyboard.device_type, "kbd")
+        self.assertEqual(keyboard.get_char_name(), "event0")
+        self.assertEqual(keyboard.info.vendor, 0x046D)
+        self.assertEqual(manager.find(uniq="pad-1"), manager.gamepads)
+
+    def test_read(self):
+        """Events written to a fake device are read as InputEvents."""
+        manager = self.tree.manager()
+        keyboard = manager.keyboards[0]
+        self.keyboard.write_events([(0x04, 0x04, 30), (0x01, 30, 1)])
+        self.assertEqual(
+            [(event.ev_type, event.code, event.state) for event in keyboard.read()],
+            [("Misc", "MSC_SCAN", 30)],
+        )
+        events = keyboard.read(timeout=0)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].code, "KEY_A")
+        self.assertEqual(keyboard.read(timeout=0)[0].code, "SYN_REPORT")
+        self.assertEqual(keyboard.read(timeout=0), [])
+
+    def test_frames(self):
+        """Whole reports come out as frames, however they are read."""
+        manager = self.tree.manager(read_size=64)
+        keyboard = manager.keyboards[0]
+        self.keyboard.write_events([(0x01, 30, 1)])
+        self.keyboard.write_events([(0x01, 30, 0), (0x01, 48, 1)])
+        frames = keyboard.frames()
+        self.assertEqual([event.state for event in next(frames)], [1])
+        self.assertEqual([event.code for event in next(frames)], ["KEY_A", "KEY_B"])
+
+    def test_refresh(self):
+        """Unplugged and new devices are picked up by refresh."""
+        manager = self.tree.manager()
+        keyboard = manager.keyboards[0]
+        self.tree.remove_device(self.keyboard)
+        self.tree.add_device("Other Keyboard")
+        added, removed = manager.refresh()
+        self.assertEqual(removed, [keyboard])
+        self.assertEqual([str(device) for device in added], ["Other Keyboard"])
+        self.assertEqual(manager.keyboards, added)
@@ -0,0 +1,79 @@
+"""Tests for hotplug.py"""
+
+# pylint: disable=protected-access,no-self-use
+from unittest import TestCase, mock, skipUnless
+import os
+import shutil
+import struct
+import tempfile
+
+from inputs import hotplug
+from inputs.libi import inotify
+from inputs.libi.system import NIX
+
+
+class InotifyTestCase(TestCase):
+    """Test the inotify wrapper."""
+
+    def test_parse_events(self):
+        """Events and their padded names are unpacked."""
+        data = struct.pack("iIII", 1, inotify.IN_CREATE, 0, 8) + b"abc\0\0\0\0\0"
+        data += struct.pack("iIII", 2, inotify.IN_DELETE, 0, 0)
+        self.assertEqual(
+            list(inotify.parse_events(data)),
+            [(1, inotify.IN_CREATE, 0, "abc"), (2, inotify.IN_DELETE, 0, "")],
+        )
+
+
+@skipUnless(NIX, "inotify is Linux-only")
+class HotplugMonitorTestCase(TestCase):
+    """Test the HotplugMonitor on a temporary directory."""
+
+    def setUp(self):
+        self.dev_input = tempfile.mkdtemp()
+        self.manager = mock.MagicMock()
+        self.added = []
+        self.removed = []
+        self.monitor = hotplug.HotplugMonitor(
+            self.manager,
+            self.added.append,
+            self.removed.append,
+            dev_input=self.dev_input,
+        )
+
+    def tearDown(self):
+        self.monitor.stop()
+        shutil.rmtree(self.dev_input)
+
+    def test_add_and_remove(self):
+        """Symlinks appearing and going add and remove devices."""
+        by_id = os.path.join(self.dev_input, "by-id")
+        os.mkdir(by_id)
+        self.assertEqual(self.monitor.process(1), [])
+
+        link = os.path.join(by_id, "usb-pad-event-joystick")
+        os.symlink("../event7", link)
+        os.symlink("../event7", os.path.join(by_id, "usb-pad-joystick"))
+        device = self.manager._add_device.return_value
+        self.assertEqual(self.monitor.process(1), [("add", device)])
+        self.manager._add_device.assert_called_once_with(link)
+        self.assertEqual(self.added, [device])
+
+        os.remove(link)
+        device = self.manager._remove_device.return_value
+        self.assertEqual(self.monitor.process(1), [("remove", device)])
+        self.manager._remove_device.assert_called_once_with(link)
+        self.assertEqual(self.removed, [device])
+
+    def test_existing_links(self):
+        """Links made before their directory was watched are added."""
+        by_path = os.path.join(self.dev_input, "by-path")
+        os.mkdir(by_path + ".tmp")
+        os.symlink("../event3", os.path.join(by_path + ".tmp", "pci-0-event-kbd"))
+        os.rename(by_path + ".tmp", by_path)
+        self.manager._add_device.return_value = None
+        self.assertEqual(self.monitor.process(1), [])
+        self.manager._add_device.assert_called_once_with(
+            os.path.join(by_path, "pci-0-event-kbd")
+        )
+        self.assertEqual(self.added, [])
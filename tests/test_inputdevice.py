@@ -1,15 +1,27 @@
 """Tests for InputDevice class."""
 
 # pylint: disable=protected-access,no-self-use
+import unittest
 from unittest import TestCase, mock
 
+import asyncio
+import io
+import os
 import struct
 
-from inputs.libi.errors import NoDevicePath
+from inputs.libi.errors import NoDevicePath, UnknownEventCode
 
 import inputs
+from inputs.devices import base
 from inputs.devices.base import InputDevice
-from inputs.libi.c import EVENT_FORMAT, EVENT_SIZE
+from inputs.libi.ioctl import AbsInfo
+from inputs.libi.sysfs import SysfsCache
+from inputs.libi.c import EVENT_FORMAT, EVENT_SIZE, EventRingBuffer, event_dtype
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 KBD_PATH = "/dev/input/by-path/platform-i8042-serio-0-event-kbd"
 EV_PATH = "/dev/input/event4"
@@ -213,6 +225,7 @@ class InputDeviceTestCase(TestCase):
     def test_do_iter(self, mock_get_data, mock_set_name):
         """InputDevice._do_iter returns an event when there is data."""
         manager = mock.MagicMock()
+        manager.get_event_names.return_value = ("Key", "KEY_A")
         inputdevice = InputDevice(manager, KBD_PATH)
         mock_set_name.assert_called()
         events = inputdevice._do_iter()
@@ -262,3 +275,598 @@ class InputDeviceTestCase(TestCase):
         self.assertEqual(inputdevice.read(), "Hello")
         self.assertEqual(inputdevice.read(), "Goodbye")
         mock_iter.assert_called()
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_get_data_drains_queue(self, mock_set_name):
+        """One read drains every queued event, up to read_size."""
+        read_fd, write_fd = os.pipe()
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH, read_size=64)
+        mock_set_name.assert_called()
+        data = b"".join(
+            struct.pack(EVENT_FORMAT, 1535009424, 612521, 1, code, 1)
+            for code in (30, 31, 32)
+        )
+        os.write(write_fd, data)
+        with io.open(read_fd, "rb", buffering=0) as read_file:
+            inputdevice._character_file = read_file
+            result = inputdevice._get_data(inputdevice._get_total_read_size())
+        os.close(write_fd)
+        self.assertEqual(result, data)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_do_iter_batch(self, mock_set_name):
+        """InputDevice._do_iter decodes a whole batch of events at once."""
+        data = b"".join(
+            struct.pack(EVENT_FORMAT, 1535009424, 612521, 1, code, 1)
+            for code in (30, 31, 32)
+        )
+        manager = mock.MagicMock()
+        manager.get_event_names.return_value = ("Key", "KEY_A")
+        inputdevice = InputDevice(manager, KBD_PATH, read_size=64)
+        mock_set_name.assert_called()
+        with mock.patch.object(InputDevice, "_get_data", return_value=data):
+            events = inputdevice._do_iter()
+        self.assertEqual(len(events), 3)
+        self.assertTrue(all(event.state == 1 for event in events))
+
+    @mock.patch.object(InputDevice, "_set_name")
+    @mock.patch.object(InputDevice, "_wait_for_data", return_value=False)
+    def test_read_timeout(self, mock_wait_for_data, mock_set_name):
+        """Read with a timeout returns an empty list if nothing arrives."""
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        self.assertEqual(inputdevice.read(timeout=0.5), [])
+        mock_wait_for_data.assert_called_once_with(0.5)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    @mock.patch.object(InputDevice, "_do_iter", return_value=["Hello"])
+    @mock.patch.object(InputDevice, "_wait_for_data", return_value=True)
+    def test_read_non_blocking(self, mock_wait_for_data, mock_do_iter, mock_set_name):
+        """A non-blocking device polls without waiting."""
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH, blocking=False)
+        mock_set_name.assert_called()
+        self.assertEqual(inputdevice.read(), ["Hello"])
+        mock_wait_for_data.assert_called_once_with(0)
+        mock_do_iter.assert_called_once()
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_wait_for_data(self, mock_set_name):
+        """_wait_for_data selects on the character device."""
+        read_fd, write_fd = os.pipe()
+        manager = mock.MagicMock()
+        manager.get_event_names.return_value = ("Key", "KEY_A")
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        with io.open(read_fd, "rb", buffering=0) as read_file:
+            inputdevice._character_file = read_file
+            self.assertEqual(inputdevice.fileno(), read_fd)
+            self.assertFalse(inputdevice._wait_for_data(0))
+            os.write(write_fd, struct.pack(EVENT_FORMAT, 1535009424, 612521, 1, 30, 1))
+            self.assertTrue(inputdevice._wait_for_data(0))
+            inputdevice.set_blocking(False)
+            self.assertFalse(os.get_blocking(read_fd))
+            events = inputdevice.read()
+            self.assertEqual(len(events), 1)
+            self.assertEqual(inputdevice.read(), [])
+        os.close(write_fd)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_aread_and_aiter(self, mock_set_name):
+        """Events can be awaited from an asyncio event loop."""
+        read_fd, write_fd = os.pipe()
+        manager = mock.MagicMock()
+        manager.get_event_names.return_value = ("Key", "KEY_A")
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+
+        async def consume():
+            first = await inputdevice.aread()
+            os.write(write_fd, struct.pack(EVENT_FORMAT, 2, 0, 1, 31, 0))
+            iterator = inputdevice.aiter()
+            second = await iterator.__anext__()
+            await iterator.aclose()
+            return first, second
+
+        with io.open(read_fd, "rb", buffering=0) as read_file:
+            inputdevice._character_file = read_file
+            os.write(write_fd, struct.pack(EVENT_FORMAT, 1, 0, 1, 30, 1))
+            first, second = asyncio.run(consume())
+        os.close(write_fd)
+        self.assertEqual(first[0].state, 1)
+        self.assertEqual(second[0].state, 0)
+        self.assertEqual(second[0].timestamp, 2)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    @mock.patch.object(inputs.DeviceManager, "_post_init")
+    def test_aread_unknown_event(self, mock_post_init, mock_set_name):
+        """Unknown events are reported when their names are used."""
+        read_fd, write_fd = os.pipe()
+        manager = inputs.DeviceManager()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        mock_post_init.assert_called()
+
+        async def consume():
+            return await asyncio.wait_for(inputdevice.aread(), 5)
+
+        with io.open(read_fd, "rb", buffering=0) as read_file:
+            inputdevice._character_file = read_file
+            os.write(write_fd, struct.pack(EVENT_FORMAT, 1, 0, 1, 0x2FE, 1))
+            events = asyncio.run(consume())
+            self.assertEqual(events[0].raw_code, 0x2FE)
+            with self.assertRaises(UnknownEventCode):
+                events[0].code  # pylint: disable=pointless-statement
+        os.close(write_fd)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    @mock.patch.object(InputDevice, "_do_iter", side_effect=EOFError)
+    def test_aiter_eof(self, mock_do_iter, mock_set_name):
+        """A closed listener pipe ends the iteration with EOFError."""
+        read_fd, write_fd = os.pipe()
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+
+        async def consume():
+            async for events in inputdevice.aiter():
+                return events
+            return None
+
+        with io.open(read_fd, "rb", buffering=0) as read_file:
+            inputdevice._character_file = read_file
+            os.write(write_fd, b"x")
+            with self.assertRaises(EOFError):
+                asyncio.run(asyncio.wait_for(consume(), 5))
+        os.close(write_fd)
+        mock_do_iter.assert_called_once()
+
+    @mock.patch.object(InputDevice, "_set_name")
+    @mock.patch.object(InputDevice, "fileno", side_effect=io.UnsupportedOperation)
+    @mock.patch.object(InputDevice, "read", side_effect=[[], ["Hello"]])
+    def test_aread_in_executor(self, mock_read, mock_fileno, mock_set_name):
+        """Devices that cannot be watched are read in a worker thread."""
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        self.assertEqual(asyncio.run(inputdevice.aread()), ["Hello"])
+        mock_fileno.assert_called()
+        self.assertEqual(
+            mock_read.call_args_list,
+            [mock.call(base.EXECUTOR_READ_TIMEOUT)] * 2,
+        )
+
+    @mock.patch.object(InputDevice, "_set_name")
+    @mock.patch.object(InputDevice, "_do_iter", side_effect=[None, ["Hello"]])
+    @mock.patch.object(InputDevice, "_wait_for_data", return_value=True)
+    def test_iter_non_blocking(self, mock_wait_for_data, mock_do_iter, mock_set_name):
+        """Iterating a non-blocking device waits for data between reads."""
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH, blocking=False)
+        mock_set_name.assert_called()
+        self.assertEqual(next(iter(inputdevice)), ["Hello"])
+        self.assertEqual(mock_wait_for_data.call_args_list, [mock.call(None)] * 2)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_do_iter_raw_tuples(self, mock_set_name):
+        """In tuple mode, reads give the raw evdev numbers."""
+        data = struct.pack(EVENT_FORMAT, 1535009424, 612521, 1, 30, 1)
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH, raw_mode=base.RAW_TUPLES)
+        mock_set_name.assert_called()
+        with mock.patch.object(InputDevice, "_get_data", return_value=data):
+            events = inputdevice._do_iter()
+        self.assertEqual(events, [(1535009424, 612521, 1, 30, 1)])
+        manager.get_event_names.assert_not_called()
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_do_iter_raw_numpy(self, mock_set_name):
+        """In numpy mode, reads give a structured array over the data."""
+        data = b"".join(
+            struct.pack(EVENT_FORMAT, 1535009424, 612521, 1, code, 1)
+            for code in (30, 31)
+        )
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH, raw_mode=base.RAW_NUMPY)
+        mock_set_name.assert_called()
+        with mock.patch.object(InputDevice, "_get_data", return_value=data):
+            events = inputdevice._do_iter()
+        self.assertEqual(list(events["code"]), [30, 31])
+        self.assertEqual(events.itemsize, EVENT_SIZE)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_set_raw_mode_invalid(self, mock_set_name):
+        """An unknown raw mode is refused."""
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        with self.assertRaises(ValueError):
+            inputdevice.set_raw_mode("bananas")
+        self.assertIsNone(inputdevice.raw_mode)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_set_raw_mode_without_numpy(self, mock_set_name):
+        """Asking for numpy mode without numpy raises ImportError."""
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        event_dtype.cache_clear()
+        try:
+            with mock.patch.dict("sys.modules", {"numpy": None}):
+                with self.assertRaises(ImportError):
+                    inputdevice.set_raw_mode(base.RAW_NUMPY)
+        finally:
+            event_dtype.cache_clear()
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_get_data_ring(self, mock_set_name):
+        """With ring slots, data is read into a reused buffer."""
+        read_fd, write_fd = os.pipe()
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(
+            manager, KBD_PATH, read_size=4, raw_mode=base.RAW_TUPLES, ring_slots=2
+        )
+        mock_set_name.assert_called()
+        with io.open(read_fd, "rb", buffering=0) as read_file:
+            inputdevice._character_file = read_file
+            batches = []
+            for code in (30, 31, 32):
+                os.write(write_fd, struct.pack(EVENT_FORMAT, 1, 0, 1, code, 1))
+                os.write(write_fd, struct.pack(EVENT_FORMAT, 1, 0, 0, 0, 0))
+                batches.append(inputdevice._do_iter())
+                if code == 30:
+                    ring = inputdevice._ring
+                self.assertIs(inputdevice._ring, ring)
+        os.close(write_fd)
+        self.assertEqual([batch[0][3] for batch in batches], [30, 31, 32])
+        self.assertEqual(len(batches[2]), 2)
+
+    def test_event_ring_buffer(self):
+        """The ring hands out each slot in turn."""
+        ring = EventRingBuffer(EVENT_SIZE, 2)
+        first = ring.next_slot()
+        second = ring.next_slot()
+        third = ring.next_slot()
+        self.assertEqual(len(first), EVENT_SIZE)
+        first[0] = 1
+        second[0] = 2
+        self.assertEqual(third[0], 1)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_frames(self, mock_set_name):
+        """Frames group the events between each SYN_REPORT."""
+        data = b"".join(
+            struct.pack(EVENT_FORMAT, 1, 0, ev_type, code, value)
+            for ev_type, code, value in (
+                (2, 0, 5),
+                (2, 1, -3),
+                (0, 0, 0),
+                (1, 0x110, 1),
+                (2, 0, 1),
+                (0, 0, 0),
+            )
+        )
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        with mock.patch.object(InputDevice, "_get_data", return_value=data):
+            frames = inputdevice.frames()
+            first = next(frames)
+            second = next(frames)
+        self.assertEqual(first.changes(), {(2, 0): 5, (2, 1): -3})
+        self.assertEqual(second.changes(), {(1, 0x110): 1, (2, 0): 1})
+        self.assertFalse(first.dropped)
+        self.assertEqual(second.timestamp, 1)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_frames_dropped(self, mock_set_name):
+        """Events up to the SYN_REPORT after a SYN_DROPPED are discarded."""
+        data = b"".join(
+            struct.pack(EVENT_FORMAT, 1, 0, ev_type, code, value)
+            for ev_type, code, value in (
+                (2, 0, 5),
+                (0, 3, 0),
+                (2, 0, 7),
+                (0, 0, 0),
+                (2, 1, 2),
+                (0, 0, 0),
+            )
+        )
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        with mock.patch.object(
+            InputDevice, "_get_data", return_value=data
+        ), mock.patch.object(InputDevice, "resync", return_value=[]):
+            frames = inputdevice.frames()
+            first = next(frames)
+            second = next(frames)
+        self.assertTrue(first.dropped)
+        self.assertEqual(len(first), 0)
+        self.assertEqual(second.changes(), {(2, 1): 2})
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_resync(self, mock_set_name):
+        """Resync gives events for the state that changed."""
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        inputdevice._character_file = mock.MagicMock()
+        inputdevice._synced = {(1, 30): 1, (3, 0): 5, (3, 1): 2}
+
+        def get_bitmap(fd, request, max_code):
+            bitmap = bytearray(max_code // 8 + 1)
+            if request is base.ioctl.EVIOCGKEY:
+                bitmap[3] = 0b10000000  # KEY_S, 31
+            return bitmap
+
+        abs_bits = bytearray(8)
+        abs_bits[0] = 0b11
+        with mock.patch.object(
+            base.ioctl, "get_bitmap", side_effect=get_bitmap
+        ), mock.patch.object(
+            base.ioctl, "get_bits", return_value=abs_bits
+        ), mock.patch.object(
+            base.ioctl,
+            "get_abs_info",
+            side_effect=lambda fd, axis: AbsInfo((9, 2)[axis], 0, 255, 0, 0, 0),
+        ):
+            events = inputdevice.resync()
+
+        self.assertEqual(
+            [(e.raw_type, e.raw_code, e.state) for e in events],
+            [(1, 30, 0), (1, 31, 1), (3, 0, 9)],
+        )
+        self.assertEqual(
+            inputdevice._synced, {(1, 30): 0, (1, 31): 1, (3, 0): 9, (3, 1): 2}
+        )
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_frames_dropped_resync(self, mock_set_name):
+        """The frame after SYN_DROPPED holds the resync events."""
+        data = b"".join(
+            struct.pack(EVENT_FORMAT, 1, 0, ev_type, code, value)
+            for ev_type, code, value in ((0, 3, 0), (2, 0, 7), (0, 0, 0))
+        )
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        with mock.patch.object(
+            InputDevice, "_get_data", return_value=data
+        ), mock.patch.object(
+            InputDevice, "resync", return_value=["synthetic"]
+        ) as mock_resync:
+            frame = next(inputdevice.frames())
+        self.assertTrue(frame.dropped)
+        self.assertEqual(frame.events, ["synthetic"])
+        self.assertEqual(mock_resync.call_args[0][0].raw_code, 0)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_track_state(self, mock_set_name):
+        """The state follows the events that are read."""
+        data = b"".join(
+            struct.pack(EVENT_FORMAT, 1, 0, ev_type, code, value)
+            for ev_type, code, value in ((1, 30, 1), (3, 0, 42), (0, 0, 0))
+        )
+        manager = mock.MagicMock()
+        manager.get_event_code.return_value = 30
+        inputdevice = InputDevice(
+            manager, KBD_PATH, track_state=True, raw_mode=base.RAW_TUPLES
+        )
+        mock_set_name.assert_called()
+        with mock.patch.object(InputDevice, "_get_data", return_value=data):
+            inputdevice._do_iter()
+        self.assertTrue(inputdevice.state.key_down("KEY_A"))
+        self.assertEqual(inputdevice.state.axis(0), 42)
+        self.assertIsNone(InputDevice(manager, KBD_PATH).state)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_snapshot_on_open(self, mock_set_name):
+        """Opening the device fills the state from the kernel."""
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH, snapshot=True)
+        mock_set_name.assert_called()
+        self.assertIsNotNone(inputdevice.state)
+
+        def get_bitmap(fd, request, max_code):
+            bitmap = bytearray(max_code // 8 + 1)
+            if request is base.ioctl.EVIOCGKEY:
+                bitmap[3] = 0b01000000  # KEY_A, 30
+            elif request is base.ioctl.EVIOCGLED:
+                bitmap[0] = 0b10  # LED_CAPSL
+            return bitmap
+
+        abs_bits = bytearray(8)
+        abs_bits[0] = 0b1
+        info = AbsInfo(12, -32768, 32767, 16, 128, 0)
+        mock_file = mock.MagicMock()
+        with mock.patch.object(
+            base.io, "open", return_value=mock_file
+        ), mock.patch.object(
+            base.ioctl, "get_bitmap", side_effect=get_bitmap
+        ), mock.patch.object(
+            base.ioctl, "get_bits", return_value=abs_bits
+        ), mock.patch.object(
+            base.ioctl, "get_abs_info", return_value=info
+        ):
+            self.assertIs(inputdevice._character_device, mock_file)
+
+        state = inputdevice.state
+        self.assertTrue(state.key_down(30))
+        self.assertTrue(state.led_on(1))
+        self.assertEqual(state.axis(0), 12)
+        self.assertEqual(state.abs_info, {0: info})
+        self.assertEqual(
+            inputdevice._synced, {(1, 30): 1, (0x11, 1): 1, (3, 0): 12}
+        )
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_info(self, mock_set_name):
+        """The device details are read from sysfs once."""
+        files = {
+            "/sys/class/input/event4/device/id/bustype": "0003\n",
+            "/sys/class/input/event4/device/id/vendor": "045e\n",
+            "/sys/class/input/event4/device/id/product": "028e\n",
+            "/sys/class/input/event4/device/id/version": "0110\n",
+            "/sys/class/input/event4/device/phys": "usb-0000:00:14.0-2/input0\n",
+            "/sys/class/input/event4/device/uniq": "\n",
+        }
+
+        def fake_open(path):
+            if path not in files:
+                raise FileNotFoundError(path)
+            return io.StringIO(files[path])
+
+        manager = mock.MagicMock()
+        manager.sys_class = "/sys/class"
+        manager.sysfs = SysfsCache()
+        inputdevice = InputDevice(
+            manager, KBD_PATH, char_path_override="/dev/input/event4"
+        )
+        mock_set_name.assert_called()
+        inputdevice.name = "Xbox 360 Pad"
+        with mock.patch.object(base, "NIX", True), mock.patch(
+            "inputs.libi.sysfs.open", side_effect=fake_open, create=True
+        ) as mock_open:
+            info = inputdevice.info
+            self.assertIs(inputdevice.info, info)
+        self.assertEqual(mock_open.call_count, 6)
+        self.assertEqual(
+            info,
+            base.DeviceInfo(
+                "Xbox 360 Pad",
+                3,
+                0x045E,
+                0x028E,
+                0x110,
+                "usb-0000:00:14.0-2/input0",
+                None,
+            ),
+        )
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_subscribe_kernel(self, mock_set_name):
+        """The mask is given to the kernel, and again on reopening."""
+        manager = mock.MagicMock()
+        manager.get_typecode.return_value = 0x01
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        inputdevice._character_file = mock.MagicMock()
+        with mock.patch.object(base.ioctl, "set_mask") as mock_set_mask:
+            self.assertTrue(inputdevice.subscribe({"Key": None}))
+            manager.get_typecode.assert_called_once_with("Key")
+            self.assertEqual(mock_set_mask.call_args_list[0][0][1], 0)
+            self.assertEqual(
+                list(base.ioctl.iter_bits(mock_set_mask.call_args_list[0][0][2])),
+                [1],
+            )
+            self.assertIsNone(inputdevice._filter)
+
+            mock_set_mask.reset_mock()
+            inputdevice.close()
+            with mock.patch.object(base.io, "open"):
+                inputdevice._character_device  # pylint: disable=pointless-statement
+            mock_set_mask.assert_called()
+
+            mock_set_mask.reset_mock()
+            inputdevice.unsubscribe()
+            self.assertEqual(
+                len(list(base.ioctl.iter_bits(mock_set_mask.call_args_list[0][0][2]))),
+                32,
+            )
+        self.assertIsNone(inputdevice._mask)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_subscribe_fallback(self, mock_set_name):
+        """Without EVIOCSMASK, the events are filtered as they are decoded."""
+        data = b"".join(
+            struct.pack(EVENT_FORMAT, 1, 0, ev_type, code, value)
+            for ev_type, code, value in ((4, 4, 30), (1, 30, 1), (0, 0, 0))
+        )
+        manager = mock.MagicMock()
+        inputdevice = InputDevice(manager, KBD_PATH)
+        mock_set_name.assert_called()
+        inputdevice._character_file = mock.MagicMock()
+        with mock.patch.object(
+            base.ioctl, "set_mask", side_effect=OSError(25, "ENOTTY")
+        ), mock.patch.object(InputDevice, "_get_data", return_value=data):
+            self.assertFalse(inputdevice.subscribe({0x01: [30]}))
+            events = inputdevice._do_iter()
+            self.assertEqual(
+                [(event.raw_type, event.raw_code) for event in events],
+                [(1, 30), (0, 0)],
+            )
+            inputdevice.set_raw_mode(base.RAW_TUPLES)
+            self.assertEqual(
+                [event[2:4] for event in inputdevice._do_iter()], [(1, 30), (0, 0)]
+            )
+            self.assertFalse(inputdevice.subscribe({0x02: None}))
+            self.assertEqual([event[2:4] for event in inputdevice._do_iter()], [(0, 0)])
+            inputdevice.unsubscribe()
+            self.assertEqual(len(inputdevice._do_iter()), 3)
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_grab(self, mock_set_name):
+        """Grabbing and releasing uses EVIOCGRAB on the open device."""
+        inputdevice = InputDevice(mock.MagicMock(), KBD_PATH)
+        mock_set_name.assert_called()
+        inputdevice._evdev = True
+        inputdevice._character_file = mock.MagicMock()
+        inputdevice._character_file.fileno.return_value = 7
+        with mock.patch.object(base.ioctl, "grab") as mock_grab:
+            with inputdevice.grabbed() as grabbed:
+                self.assertIs(grabbed, inputdevice)
+                mock_grab.assert_called_once_with(7)
+                self.assertTrue(inputdevice._grabbed)
+            mock_grab.assert_called_with(7, False)
+            self.assertFalse(inputdevice._grabbed)
+
+            inputdevice.grab()
+            inputdevice.close()
+            self.assertFalse(inputdevice._grabbed)
+            mock_grab.reset_mock()
+            inputdevice.ungrab()
+            mock_grab.assert_not_called()
+
+        inputdevice._evdev = False
+        with self.assertRaises(NotImplementedError):
+            inputdevice.grab()
+
+    @mock.patch.object(InputDevice, "_set_name")
+    def test_passthrough(self, mock_set_name):
+        """Each read is remapped and written to the sink in one go."""
+        inputdevice = InputDevice(mock.MagicMock(), KBD_PATH)
+        mock_set_name.assert_called()
+        reads = [
+            b"".join(
+                struct.pack(EVENT_FORMAT, 1, 0, ev_type, code, value)
+                for ev_type, code, value in ((4, 4, 30), (1, 30, 1), (0, 0, 0))
+            ),
+            struct.pack(EVENT_FORMAT, 2, 0, 1, 58, 1),
+        ]
+
+        def remap(ev_type, code, value):
+            if ev_type == 4:
+                return None
+            if (ev_type, code) == (1, 58):
+                return ev_type, 1, value
+            return ev_type, code, value
+
+        read_fd, write_fd = os.pipe()
+        try:
+            with mock.patch.object(InputDevice, "_iter_data", return_value=reads):
+                inputdevice.passthrough(write_fd)
+                self.assertEqual(os.read(read_fd, 1024), b"".join(reads))
+                with mock.patch("os.write", wraps=os.write) as mock_write:
+                    inputdevice.passthrough(write_fd, remap)
+                self.assertEqual(mock_write.call_count, 2)
+            self.assertEqual(
+                [event[2:] for event in base.iter_unpack(os.read(read_fd, 1024))],
+                [(1, 30, 1), (0, 0, 0), (1, 1, 1)],
+            )
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
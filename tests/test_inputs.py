@@ -5,7 +5,12 @@ from unittest import TestCase
 
 from inputs.libi.event import InputEvent
 from inputs.libi.c import convert_timeval
-from inputs.utils import get_key, get_mouse, get_gamepad
+from inputs.libi import ioctl
+from inputs.libi.state import DeviceState
+from inputs.libi.capabilities import Capabilities
+from inputs.libi.sysfs import SysfsCache
+from inputs.libi.mask import EventMask
+from inputs.utils import get_key, get_mouse, get_gamepad, _LazyDeviceManager
 from inputs.libi.errors import UnpluggedError
 from unittest import mock
 
@@ -35,6 +40,26 @@ class InputEventTestCase(TestCase):
         self.assertEqual(event.timestamp, 1530900876.367757)
         self.assertEqual(event.code, "KEY_ENTER")
 
+    def test_input_event_from_raw(self):
+        """Names are only looked up when they are first used."""
+        device = mock.MagicMock()
+        device.manager.get_event_names.return_value = ("Key", "KEY_A")
+        event = InputEvent.from_raw(device, 1535013055, 447534, 1, 30, 1)
+        self.assertEqual(event.raw_type, 1)
+        self.assertEqual(event.raw_code, 30)
+        self.assertEqual(event.state, 1)
+        device.manager.get_event_names.assert_not_called()
+
+        self.assertEqual(event.ev_type, "Key")
+        self.assertEqual(event.code, "KEY_A")
+        self.assertEqual(event.timestamp, 1535013055.447534)
+        device.manager.get_event_names.assert_called_once_with(1, 30)
+
+    def test_input_event_slots(self):
+        """Events have no instance dictionary."""
+        event = InputEvent.from_raw(None, 1, 0, 0, 0, 0)
+        self.assertFalse(hasattr(event, "__dict__"))
+
 
 class HelpersTestCase(TestCase):
     """Test the easy helper methods."""
@@ -121,3 +146,191 @@ class ConvertTimevalTestCase(TestCase):
         self.assertEqual(convert_timeval(0), (0, 0))
         self.assertEqual(convert_timeval(100), (100, 0))
         self.assertEqual(convert_timeval(0.001), (0, 1000))
+
+
+class IoctlTestCase(TestCase):
+    """Test the evdev ioctl helpers."""
+
+    def test_request_numbers(self):
+        """The request numbers match the ones in linux/input.h."""
+        self.assertEqual(ioctl.EVIOCGKEY(96), 0x80604518)
+        self.assertEqual(ioctl.EVIOCGBIT(ioctl.EV_ABS, 8), 0x80084523)
+        self.assertEqual(ioctl.EVIOCGABS(0), 0x80184540)
+        self.assertEqual(ioctl.EVIOCGRAB(), 0x40044590)
+        self.assertEqual(ioctl.UI_SET_BIT(ioctl.EV_KEY), 0x40045565)
+        self.assertEqual(ioctl.UI_DEV_CREATE(), 0x5501)
+
+    def test_iter_bits(self):
+        """Each set bit in the bitmap is found."""
+        self.assertEqual(
+            list(ioctl.iter_bits(bytearray([0b10000001, 0, 0b100]))), [0, 7, 18]
+        )
+        self.assertEqual(list(ioctl.iter_bits(bytearray(4))), [])
+
+
+class DeviceStateTestCase(TestCase):
+    """Test the DeviceState class."""
+
+    def test_keys(self):
+        """Keys are down from press (or repeat) until release."""
+        state = DeviceState()
+        state.update(ioctl.EV_KEY, 30, 1)
+        state.update(ioctl.EV_KEY, 0x110, 2)
+        self.assertTrue(state.key_down(30))
+        self.assertTrue(state.key_down(0x110))
+        self.assertEqual(state.pressed(), [30, 0x110])
+        state.update(ioctl.EV_KEY, 30, 0)
+        self.assertFalse(state.key_down(30))
+        self.assertEqual(state.keys[30 >> 3], 0)
+        self.assertFalse(state.key_down(0x2FF + 8))
+
+    def test_axes_leds_switches(self):
+        """Axes keep their last value, LEDs and switches are bits."""
+        state = DeviceState()
+        state.update(ioctl.EV_ABS, 1, -200)
+        state.update(ioctl.EV_LED, 1, 1)
+        state.update(ioctl.EV_SW, 0, 1)
+        state.update(ioctl.EV_REL, 0, 5)
+        self.assertEqual(state.axis(1), -200)
+        self.assertEqual(state.axis(0), 0)
+        self.assertTrue(state.led_on(1))
+        self.assertTrue(state.switch_on(0))
+        state.clear()
+        self.assertEqual(state.axis(1), 0)
+        self.assertFalse(state.led_on(1))
+
+    def test_names(self):
+        """Names are turned into codes by the lookup."""
+        state = DeviceState({"KEY_A": 30, "ABS_Y": 1}.__getitem__)
+        state.update(ioctl.EV_KEY, 30, 1)
+        state.update(ioctl.EV_ABS, 1, 7)
+        self.assertTrue(state.key_down("KEY_A"))
+        self.assertEqual(state.axis("ABS_Y"), 7)
+        with self.assertRaises(TypeError):
+            DeviceState().key_down("KEY_A")
+
+
+class CapabilitiesTestCase(TestCase):
+    """Test the Capabilities class."""
+
+    @staticmethod
+    def _bitmap(max_code, *codes):
+        bitmap = bytearray(max_code // 8 + 1)
+        for code in codes:
+            bitmap[code >> 3] |= 1 << (code & 7)
+        return bitmap
+
+    def test_from_fd(self):
+        """The types and the codes of each type are asked for."""
+        bitmaps = {
+            0x00: self._bitmap(0x1F, 0x00, 0x01, 0x02),
+            0x01: self._bitmap(0x2FF, 0x110, 0x111),
+            0x02: self._bitmap(0x0F, 0, 1),
+        }
+        calls = []
+
+        def get_bits(fd, ev_type, max_code):
+            calls.append(ev_type)
+            return bitmaps[ev_type]
+
+        with mock.patch.object(ioctl, "get_bits", side_effect=get_bits):
+            capabilities = Capabilities.from_fd(3)
+        self.assertEqual(calls, [0x00, 0x01, 0x02])
+        self.assertTrue(capabilities.has(0x02))
+        self.assertFalse(capabilities.has(0x03))
+        self.assertTrue(capabilities.has(0x01, 0x110))
+        self.assertFalse(capabilities.has(0x01, 30))
+        self.assertFalse(capabilities.has(0x03, 0))
+        self.assertEqual(capabilities.event_codes(0x02), [0, 1])
+        self.assertEqual(capabilities.classify(), "mouse")
+
+    def test_classify(self):
+        """Gamepads, keyboards and the rest are told apart."""
+        gamepad = Capabilities(
+            self._bitmap(0x1F, 1, 3),
+            {1: self._bitmap(0x2FF, 0x130), 3: self._bitmap(0x3F, 0, 1)},
+        )
+        keyboard = Capabilities(
+            self._bitmap(0x1F, 1), {1: self._bitmap(0x2FF, *range(1, 60))}
+        )
+        power = Capabilities(self._bitmap(0x1F, 1), {1: self._bitmap(0x2FF, 116)})
+        self.assertEqual(gamepad.classify(), "joystick")
+        self.assertEqual(keyboard.classify(), "kbd")
+        self.assertIsNone(power.classify())
+
+
+class LazyDeviceManagerTestCase(TestCase):
+    """Test that the shared devices are only looked for when used."""
+
+    @mock.patch("inputs.utils.DeviceManager")
+    def test_lazy(self, mock_manager):
+        """The DeviceManager is made on first use, and only once."""
+        lazy = _LazyDeviceManager()
+        mock_manager.assert_not_called()
+        mock_manager.return_value.keyboards = ["keyboard"]
+        mock_manager.return_value.__getitem__.return_value = "device"
+        self.assertEqual(lazy.keyboards, ["keyboard"])
+        self.assertEqual(lazy[0], "device")
+        mock_manager.assert_called_once_with()
+
+
+class SysfsCacheTestCase(TestCase):
+    """Test the SysfsCache class."""
+
+    def test_read_once(self):
+        """Each file is only read until it is invalidated."""
+        cache = SysfsCache()
+        path = "/sys/class/input/event1/device/name"
+        with mock.patch(
+            "inputs.libi.sysfs.open", mock.mock_open(read_data="Pad\n"), create=True
+        ) as mock_open:
+            self.assertEqual(cache.read(path), "Pad")
+            self.assertEqual(cache.read(path), "Pad")
+            self.assertEqual(mock_open.call_count, 1)
+            cache.invalidate("/sys/class/input/event2/")
+            cache.read(path)
+            self.assertEqual(mock_open.call_count, 1)
+            cache.invalidate("/sys/class/input/event1/")
+            cache.read(path)
+            self.assertEqual(mock_open.call_count, 2)
+            cache.invalidate()
+            cache.read(path)
+            self.assertEqual(mock_open.call_count, 3)
+
+    def test_read_error(self):
+        """Files that can't be read raise OSError and aren't kept."""
+        cache = SysfsCache()
+        with mock.patch(
+            "inputs.libi.sysfs.open", side_effect=FileNotFoundError, create=True
+        ):
+            with self.assertRaises(OSError):
+                cache.read("/sys/class/input/event9/device/name")
+        self.assertEqual(cache._files, {})
+
+
+class EventMaskTestCase(TestCase):
+    """Test the EventMask class."""
+
+    def test_accepts(self):
+        """Whole types, single codes and SYN are accepted."""
+        mask = EventMask({ioctl.EV_KEY: None, ioctl.EV_ABS: [0, 1]})
+        self.assertTrue(mask.accepts(ioctl.EV_KEY, 30))
+        self.assertTrue(mask.accepts(ioctl.EV_ABS, 1))
+        self.assertTrue(mask.accepts(ioctl.EV_SYN, 0))
+        self.assertFalse(mask.accepts(ioctl.EV_ABS, 2))
+        self.assertFalse(mask.accepts(ioctl.EV_MSC, 4))
+        self.assertTrue(EventMask().accepts(ioctl.EV_MSC, 4))
+
+    def test_bitmaps(self):
+        """The bitmaps have the types and codes wanted set."""
+        mask = EventMask({ioctl.EV_KEY: None, ioctl.EV_ABS: [0, 1]})
+        bitmaps = dict(mask.bitmaps())
+        self.assertEqual(list(mask.bitmaps())[0][0], ioctl.EV_SYN)
+        self.assertEqual(list(ioctl.iter_bits(bitmaps[ioctl.EV_SYN])), [1, 3])
+        self.assertEqual(len(list(ioctl.iter_bits(bitmaps[ioctl.EV_KEY]))), 0x300)
+        self.assertEqual(list(ioctl.iter_bits(bitmaps[ioctl.EV_ABS])), [0, 1])
+        self.assertEqual(list(ioctl.iter_bits(bitmaps[ioctl.EV_MSC])), [])
+
+    def test_request_number(self):
+        """EVIOCSMASK matches linux/input.h."""
+        self.assertEqual(ioctl.EVIOCSMASK(), 0x40104593)
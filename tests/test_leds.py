@@ -68,6 +68,16 @@ class LEDTestCase(TestCase):
         max_brightness = led.max_brightness()
         self.assertEqual(max_brightness, 2)
 
+    def test_max_brightness_read_once(self):
+        """max_brightness can't change, so it is only read once."""
+        led = LED(None, PATH, NAME)
+        with mock.patch(
+            "inputs.devices.led.led.open", mock.mock_open(read_data="255")
+        ) as mock_open:
+            self.assertEqual(led.max_brightness(), 255)
+            self.assertEqual(led.max_brightness(), 255)
+        mock_open.assert_called_once()
+
     @mock.patch("inputs.devices.led.led.open", mock.mock_open(read_data="Brilliant"))
     def test_led_max_brightness_non_num(self):
         """Status returns the max brightness level as a string."""
@@ -150,6 +160,7 @@ CODES_DICT = {"LED_type_codes": {"capslock": 1}}
 def setup_mock_manager():
     """Make a mock that works like a DeviceManager."""
     manager = mock.MagicMock()
+    manager.dev_input = "/dev/input"
     manager.get_typecode.return_value = 17
     manager.codes.__contains__.side_effect = CODES_DICT.__contains__
     manager.codes.__getitem__.side_effect = CODES_DICT.__getitem__
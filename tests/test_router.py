@@ -0,0 +1,107 @@
+"""Tests for router.py"""
+
+# pylint: disable=protected-access,no-self-use
+from unittest import TestCase, mock
+import os
+
+from inputs.libi.capabilities import Capabilities
+from inputs.libi.event import InputEvent
+from inputs.router import EventRouter
+
+
+def make_event(device, ev_type, code, value=1):
+    """Make an InputEvent from raw numbers."""
+    return InputEvent.from_raw(device, 1, 0, ev_type, code, value)
+
+
+class EventRouterTestCase(TestCase):
+    """Test the EventRouter."""
+
+    def setUp(self):
+        self.manager = mock.MagicMock()
+        self.manager.get_typecode.side_effect = {"Key": 0x01, "Absolute": 0x03}.get
+        self.manager.get_event_code.side_effect = {"KEY_A": 30, "ABS_X": 0}.get
+        self.keyboard = mock.MagicMock()
+        self.gamepad = mock.MagicMock()
+        self.router = EventRouter(self.manager)
+
+    def test_dispatch(self):
+        """Handlers get the events that match their subscription."""
+        calls = []
+        self.router.subscribe(calls.append, "Key", "KEY_A")
+        self.router.subscribe(lambda event: calls.append("key"), 0x01)
+        self.router.subscribe(lambda event: calls.append("pad"), device=self.gamepad)
+        key_a = make_event(self.keyboard, 0x01, 30)
+        key_b = make_event(self.keyboard, 0x01, 48)
+        abs_x = make_event(self.gamepad, 0x03, 0)
+        self.assertEqual(self.router.dispatch([key_a, key_b, abs_x]), 4)
+        self.assertEqual(calls, [key_a, "key", "key", "pad"])
+
+    def test_table(self):
+        """Handlers are looked up once per combination, and looked up
+        again after the subscriptions change."""
+        handler = mock.MagicMock()
+        self.router.subscribe(handler, 0x01)
+        self.router.dispatch([make_event(self.keyboard, 0x01, 30)] * 2)
+        self.assertEqual(self.router._table, {(self.keyboard, 0x01, 30): (handler,)})
+        self.router.unsubscribe(handler)
+        self.assertEqual(self.router._table, {})
+        self.assertEqual(self.router.dispatch([make_event(self.keyboard, 1, 30)]), 0)
+        self.assertEqual(handler.call_count, 2)
+
+    def test_route(self):
+        """route() subscribes the function it decorates."""
+
+        @self.router.route("Absolute", "ABS_X")
+        def _handler(event):
+            pass
+
+        self.assertEqual(self.router._routes, [(_handler, None, 0x03, 0)])
+
+    def test_code_needs_type(self):
+        """A code on its own is ambiguous."""
+        with self.assertRaises(ValueError):
+            self.router.subscribe(mock.MagicMock(), code=30)
+
+    def test_events_for(self):
+        """The subscriptions become a device.subscribe() mask."""
+        self.router.subscribe(mock.MagicMock(), 0x01, 30)
+        self.router.subscribe(mock.MagicMock(), 0x01, 48)
+        self.router.subscribe(mock.MagicMock(), 0x03, device=self.gamepad)
+        self.assertEqual(self.router.events_for(self.keyboard), {0x01: [30, 48]})
+        self.assertEqual(
+            self.router.events_for(self.gamepad), {0x01: [30, 48], 0x03: None}
+        )
+        self.router.subscribe(mock.MagicMock(), device=self.keyboard)
+        self.assertIsNone(self.router.events_for(self.keyboard))
+
+    def test_devices(self):
+        """Devices that can't send a wanted event are left out."""
+        abs_only = bytearray(4)
+        abs_only[0] = 1 << 0x03
+        self.gamepad.capabilities = Capabilities(abs_only, {0x03: b"\x01"})
+        other = mock.MagicMock()
+        other.capabilities = None
+        self.manager.all_devices = [self.keyboard, self.gamepad, other]
+        self.keyboard.capabilities = Capabilities(bytearray(4), {})
+        self.router.subscribe(mock.MagicMock(), 0x03, 0)
+        self.assertEqual(self.router.devices(), [self.gamepad, other])
+        self.router.subscribe(mock.MagicMock(), device=self.keyboard)
+        self.assertEqual(self.router.devices(), [self.keyboard, self.gamepad, other])
+
+    def test_poll(self):
+        """Readable devices are read and their events dispatched."""
+        read_fd, write_fd = os.pipe()
+        try:
+            self.keyboard.fileno.return_value = read_fd
+            self.keyboard.read.return_value = [make_event(self.keyboard, 1, 30)]
+            handler = mock.MagicMock()
+            self.router.subscribe(handler)
+            self.assertEqual(self.router.poll(0, [self.keyboard]), 0)
+            os.write(write_fd, b"x")
+            self.assertEqual(self.router.poll(0, [self.keyboard]), 1)
+            self.keyboard.read.assert_called_once_with(0)
+            handler.assert_called_once_with(self.keyboard.read.return_value[0])
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
@@ -0,0 +1,140 @@
+"""Tests for virtual.py"""
+
+# pylint: disable=protected-access,no-self-use
+from unittest import TestCase, mock
+import struct
+
+from inputs.devices.virtual import virtual
+from inputs.devices.virtual.virtual import VirtualDevice
+from inputs.libi import ioctl
+from inputs.libi.c import EVENT_FORMAT, iter_unpack
+
+
+@mock.patch.object(virtual, "NIX", True)
+@mock.patch.object(virtual.ioctl, "uinput_create")
+@mock.patch.object(virtual.ioctl, "uinput_enable")
+@mock.patch.object(virtual.os, "write")
+@mock.patch.object(virtual.os, "open", return_value=9)
+class VirtualDeviceTestCase(TestCase):
+    """Test the VirtualDevice class, without a real /dev/uinput."""
+
+    def test_create(self, mock_open, mock_write, mock_enable, mock_create):
+        """The codes are enabled, the device described and created."""
+        manager = mock.MagicMock()
+        manager.get_typecode.return_value = ioctl.EV_KEY
+        manager.get_event_code.return_value = 30
+        device = VirtualDevice(
+            {"Key": ["KEY_A", 48], ioctl.EV_ABS: [0]},
+            name="test pad",
+            vendor=0x45E,
+            abs_info={0: ioctl.AbsInfo(0, -10, 10, 1, 2, 0)},
+            manager=manager,
+        )
+        mock_open.assert_called_once_with("/dev/uinput", mock.ANY)
+        self.assertEqual(device.fileno(), 9)
+        self.assertEqual(
+            [call[0][1:] for call in mock_enable.call_args_list],
+            [(0, 1), (1, 30), (1, 48), (0, 3), (3, 0)],
+        )
+        user_dev = struct.unpack(
+            virtual.UINPUT_USER_DEV_FORMAT, mock_write.call_args[0][1]
+        )
+        self.assertEqual(user_dev[0].rstrip(b"\0"), b"test pad")
+        self.assertEqual(user_dev[1:6], (virtual.BUS_VIRTUAL, 0x45E, 0, 1, 0))
+        axes = user_dev[6:]
+        self.assertEqual(axes[0], 10)
+        self.assertEqual(axes[virtual.ABS_CNT], -10)
+        self.assertEqual(axes[2 * virtual.ABS_CNT], 1)
+        self.assertEqual(axes[3 * virtual.ABS_CNT], 2)
+        mock_create.assert_called_once_with(9)
+
+    def test_create_fails(self, mock_open, mock_write, mock_enable, mock_create):
+        """uinput is closed again if the device can't be made."""
+        mock_create.side_effect = OSError(22, "EINVAL")
+        with mock.patch.object(virtual.os, "close") as mock_close:
+            with self.assertRaises(OSError):
+                VirtualDevice.mouse()
+            mock_close.assert_called_once_with(9)
+        mock_open.assert_called()
+        mock_write.assert_called()
+        mock_enable.assert_called()
+
+    def test_permission_error(self, mock_open, mock_write, mock_enable, mock_create):
+        """Not being allowed to open uinput gets the usual advice."""
+        mock_open.side_effect = PermissionError
+        with self.assertRaises(PermissionError) as context:
+            VirtualDevice.keyboard()
+        self.assertEqual(str(context.exception), virtual.PERMISSIONS_ERROR_TEXT)
+        mock_write.assert_not_called()
+        mock_enable.assert_not_called()
+        mock_create.assert_not_called()
+
+    def test_write_events(self, mock_open, mock_write, mock_enable, mock_create):
+        """A batch of events and a SYN_REPORT go in one write."""
+        device = VirtualDevice.gamepad()
+        mock_open.assert_called()
+        mock_enable.assert_called()
+        mock_create.assert_called()
+        mock_write.reset_mock()
+        self.assertEqual(device.write_events([(3, 0, 100), (1, 0x130, 1)]), 3)
+        mock_write.assert_called_once()
+        self.assertEqual(
+            list(iter_unpack(bytes(mock_write.call_args[0][1]))),
+            [(0, 0, 3, 0, 100), (0, 0, 1, 0x130, 1), (0, 0, 0, 0, 0)],
+        )
+        self.assertEqual(device.write_events([(1, 0x130, 0)], syn=False), 1)
+        self.assertEqual(
+            bytes(mock_write.call_args[0][1]),
+            struct.pack(EVENT_FORMAT, 0, 0, 1, 0x130, 0),
+        )
+
+    def test_close(self, mock_open, mock_write, mock_enable, mock_create):
+        """The device is removed at the end of a with block."""
+        with mock.patch.object(
+            virtual.ioctl, "uinput_destroy"
+        ) as mock_destroy, mock.patch.object(virtual.os, "close") as mock_close:
+            with VirtualDevice.keyboard() as device:
+                self.assertEqual(device.name, "inputs virtual keyboard")
+            mock_destroy.assert_called_once_with(9)
+            mock_close.assert_called_once_with(9)
+            device.close()
+            mock_close.assert_called_once_with(9)
+        mock_open.assert_called()
+        mock_write.assert_called()
+        mock_enable.assert_called()
+        mock_create.assert_called()
+
+    def test_from_device(self, mock_open, mock_write, mock_enable, mock_create):
+        """A copy of a device has its events, axes and ids."""
+        types = bytearray(4)
+        types[0] = (1 << ioctl.EV_KEY) | (1 << ioctl.EV_ABS)
+        source = mock.MagicMock()
+        source.name = "Pad"
+        source.capabilities = mock.MagicMock(types=types)
+        source.capabilities.event_codes.side_effect = {1: [0x130], 3: [0, 1]}.get
+        source.info = mock.MagicMock(bustype=3, vendor=1, product=2, version=None)
+        absinfo = ioctl.AbsInfo(0, 0, 255, 0, 0, 0)
+        with mock.patch.object(virtual.ioctl, "get_abs_info", return_value=absinfo):
+            device = VirtualDevice.from_device(source)
+        self.assertEqual(device.name, "Pad (virtual)")
+        self.assertEqual(device.events, {1: [0x130], 3: [0, 1]})
+        self.assertEqual(device.abs_info, {0: absinfo, 1: absinfo})
+        self.assertEqual(device._id, (3, 1, 2, 1))
+        mock_open.assert_called()
+        mock_write.assert_called()
+        mock_enable.assert_called()
+        mock_create.assert_called()
+
+        source.capabilities = None
+        with self.assertRaises(ValueError):
+            VirtualDevice.from_device(source)
+
+    def test_not_linux(self, mock_open, mock_write, mock_enable, mock_create):
+        """uinput is Linux only."""
+        with mock.patch.object(virtual, "NIX", False):
+            with self.assertRaises(NotImplementedError):
+                VirtualDevice.keyboard()
+        mock_open.assert_not_called()
+        mock_write.assert_not_called()
+        mock_enable.assert_not_called()
+        mock_create.assert_not_called()